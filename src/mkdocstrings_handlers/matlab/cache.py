@@ -0,0 +1,366 @@
+"""Caches of rendered HTML fragments, highlighted code and source tokens, in memory or on disk."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from textwrap import dedent
+from typing import TYPE_CHECKING, Any, NamedTuple
+from xml.etree.ElementTree import Element, fromstring, tostring
+
+from markupsafe import Markup
+from maxx.collection import CONTENTS_FILE
+from maxx.objects import Alias, Class
+from mkdocstrings import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from maxx.objects import Object
+    from pygments.lexer import Lexer
+    from pygments.token import _TokenType
+
+    Token = tuple[_TokenType, str]
+
+__all__ = ["HighlightCache", "RenderCache", "RenderedFragment", "SourceTokensCache"]
+
+_CACHE_VERSION = 2
+_FOLDER_FILES = (CONTENTS_FILE, "README.md", "readme.md")
+
+_logger = get_logger(__name__)
+
+
+class RenderedFragment(NamedTuple):
+    """The result of rendering an object."""
+
+    html: str
+    """The rendered HTML."""
+    headings: list[Element]
+    """The headings registered while rendering."""
+    warnings: tuple[tuple[str, int, str], ...] = ()
+    """The warnings logged while rendering, as logger name, level and message."""
+
+
+class RenderCache:
+    """On-disk cache of the HTML rendered for objects.
+
+    Entries are keyed by a digest of everything the rendered HTML depends on: the object
+    and its rendering options, the templates, the content of the source files of the object,
+    its members and its base classes, and the identifiers available for cross-references.
+    Keys are built by [`key`][mkdocstrings_handlers.matlab.cache.RenderCache.key].
+    """
+
+    def __init__(self, directory: Path) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            directory: The directory to store the cache entries in.
+        """
+        self.directory = directory
+        """The directory holding the cache entries."""
+        self._digests: dict[Path, tuple[int, int, str]] = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _digest(self, path: Path) -> str:
+        """Return the digest of the content of a file, reusing it while the file is unchanged.
+
+        Parameters:
+            path: The path of the file.
+
+        Returns:
+            The digest of the file content, or an empty string if the file does not exist.
+        """
+        try:
+            stat = path.stat()
+        except OSError:
+            return ""
+        cached = self._digests.get(path)
+        if cached is not None and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self._digests[path] = (stat.st_size, stat.st_mtime_ns, digest)
+        return digest
+
+    def key(self, model: Object, *parts: str) -> str:
+        """Return the cache key of an object.
+
+        Parameters:
+            model: The object to render.
+            *parts: The other inputs of the rendering, e.g. the options and templates.
+
+        Returns:
+            The cache key.
+        """
+        sources: set[Path] = set()
+        _collect_sources(model, sources, set())
+        hasher = hashlib.sha256(str(_CACHE_VERSION).encode())
+        for part in (model.kind.value, model.path, *parts):
+            hasher.update(b"\0" + part.encode())
+        for path in sorted(sources):
+            hasher.update(f"\0{path}\0{self._digest(path)}".encode())
+        return hasher.hexdigest()
+
+    def load(self, key: str) -> RenderedFragment | None:
+        """Load a rendered fragment.
+
+        Parameters:
+            key: The cache key.
+
+        Returns:
+            The rendered fragment, or `None` if it is not cached.
+        """
+        try:
+            data = json.loads(self._entry(key).read_text(encoding="utf-8"))
+            return RenderedFragment(
+                data["html"],
+                [fromstring(heading) for heading in data["headings"]],
+                tuple((name, level, message) for name, level, message in data["warnings"]),
+            )
+        except FileNotFoundError:
+            return None
+        except Exception as error:  # noqa: BLE001
+            _logger.debug(f"Ignoring unreadable render cache entry {key}: {error}")
+            return None
+
+    def dump(self, key: str, fragment: RenderedFragment) -> None:
+        """Store a rendered fragment.
+
+        Parameters:
+            key: The cache key.
+            fragment: The rendered fragment.
+        """
+        data = {
+            "html": fragment.html,
+            "headings": [tostring(heading, encoding="unicode") for heading in fragment.headings],
+            "warnings": fragment.warnings,
+        }
+        # Write to a temporary file first so that concurrent builds never read partial entries.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(tmp, self._entry(key))
+        except Exception as error:  # noqa: BLE001
+            _logger.debug(f"Could not write render cache entry {key}: {error}")
+            Path(tmp).unlink(missing_ok=True)
+
+
+class HighlightCache:
+    """Cache of highlighted code, in memory and optionally on disk.
+
+    Entries are keyed by a digest of the code and of all the highlighting arguments
+    (language, first line number, line numbers, CSS classes, etc.), within a namespace
+    that identifies the configuration of the highlighter.
+    """
+
+    def __init__(self, directory: Path | None = None, maxsize: int = 1024) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            directory: The directory to store the cache entries in, if any.
+            maxsize: The maximum number of entries kept in memory,
+                the least recently used are evicted first.
+        """
+        self.directory = directory
+        """The directory holding the cache entries, if any."""
+        self.maxsize = maxsize
+        """The maximum number of entries kept in memory."""
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def highlight(
+        self,
+        highlight: Callable[..., str],
+        namespace: str,
+        src: str,
+        language: str | None = None,
+        **kwargs: Any,
+    ) -> Markup:
+        """Highlight code, reusing the result of a previous call with the same arguments.
+
+        Parameters:
+            highlight: The function highlighting code, used on cache misses.
+            namespace: An identifier of the configuration of the highlighting function.
+            src: The code to highlight.
+            language: The language of the code.
+            **kwargs: Other arguments passed on to the highlighting function.
+
+        Returns:
+            The highlighted code as HTML text, marked safe.
+        """
+        if isinstance(src, Markup):
+            src = src.unescape()
+        key = hashlib.sha256(
+            json.dumps([namespace, src, language, kwargs], sort_keys=True, default=repr).encode()
+        ).hexdigest()
+        with self._lock:
+            html = self._entries.get(key)
+            if html is not None:
+                self._entries.move_to_end(key)
+                return Markup(html)
+
+        html = self._load(key)
+        if html is None:
+            html = str(highlight(src, language, **kwargs))
+            self._dump(key, html)
+        with self._lock:
+            self._entries[key] = html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return Markup(html)
+
+    def _load(self, key: str) -> str | None:
+        if self.directory is None:
+            return None
+        try:
+            return (self.directory / f"{key}.html").read_text(encoding="utf-8")
+        except OSError:
+            return None
+
+    def _dump(self, key: str, html: str) -> None:
+        if self.directory is None:
+            return
+        # Write to a temporary file first so that concurrent builds never read partial entries.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                file.write(html)
+            os.replace(tmp, self.directory / f"{key}.html")
+        except Exception as error:  # noqa: BLE001
+            _logger.debug(f"Could not write highlight cache entry {key}: {error}")
+            Path(tmp).unlink(missing_ok=True)
+
+
+class SourceTokensCache:
+    """Least recently used cache of the tokens of source files.
+
+    Each file is lexed once, as a whole, and the tokens of the source of an object
+    are sliced from the tokens of its lines. Entries are only reused for the same list
+    of lines, so that files are lexed again once they are collected again.
+    """
+
+    def __init__(self, maxsize: int = 256) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            maxsize: The maximum number of files, the least recently used are evicted first.
+        """
+        self.maxsize = maxsize
+        """The maximum number of files."""
+        self._entries: OrderedDict[tuple, tuple[list[str], list[list[Token]]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _lex(self, lexer: Lexer, path: Path, lines: list[str]) -> list[list[Token]]:
+        """Return the tokens of each line of a file, lexing the file on first use.
+
+        Parameters:
+            lexer: The lexer.
+            path: The path of the file.
+            lines: The lines of the file.
+
+        Returns:
+            The tokens of each line, each line ending with a newline token.
+        """
+        key = (path, type(lexer), repr(sorted(lexer.options.items())))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is lines:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        # Newlines are split from tokens spanning several lines,
+        # which does not change how formatters render them.
+        tokenized: list[list[Token]] = [[]]
+        for _, token_type, value in lexer.get_tokens_unprocessed("\n".join(lines) + "\n"):
+            first, *others = value.split("\n")
+            if first:
+                tokenized[-1].append((token_type, first))
+            for part in others:
+                tokenized[-1].append((token_type, "\n"))
+                tokenized.append([(token_type, part)] if part else [])
+        with self._lock:
+            self._entries[key] = (lines, tokenized)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return tokenized
+
+    def slice(
+        self,
+        lexer: Lexer,
+        path: Path,
+        lines: list[str],
+        lineno: int,
+        endlineno: int,
+    ) -> list[Token]:
+        """Return the tokens of a range of lines of a file, dedented.
+
+        Parameters:
+            lexer: The lexer.
+            path: The path of the file.
+            lines: The lines of the file.
+            lineno: The first line of the range, starting at 1.
+            endlineno: The last line of the range.
+
+        Returns:
+            The tokens, with the common leading whitespace removed from the lines
+            as [`textwrap.dedent`][] does.
+        """
+        tokenized = self._lex(lexer, path, lines)[lineno - 1 : endlineno]
+        selected = lines[lineno - 1 : endlineno]
+        tokens: list[Token] = []
+        for line, dedented, line_tokens in zip(
+            selected, dedent("\n".join(selected)).split("\n"), tokenized
+        ):
+            strip = len(line) - len(dedented)
+            for token_type, value in line_tokens:
+                if strip and value != "\n":
+                    stripped = value[strip:]
+                    strip -= len(value) - len(stripped)
+                    value = stripped
+                if value:
+                    tokens.append((token_type, value))
+        return tokens
+
+
+def _collect_sources(model: Object | Alias, sources: set[Path], seen: set[int]) -> None:
+    """Collect the files an object is rendered from.
+
+    Parameters:
+        model: The object.
+        sources: The set to add the paths of the files to.
+        seen: The identities of the objects visited so far.
+    """
+    if isinstance(model, Alias):
+        model = model.target
+    if id(model) in seen:
+        return
+    seen.add(id(model))
+
+    filepath = getattr(model, "filepath", None)
+    if filepath is not None:
+        if filepath.is_dir():
+            sources.update(filepath / name for name in _FOLDER_FILES)
+        else:
+            sources.add(filepath)
+
+    for member in model.members.values():
+        _collect_sources(member, sources, seen)
+
+    if isinstance(model, Class) and model.paths_collection is not None:
+        # Base classes contribute inherited members and the inheritance diagram.
+        for base in model.bases:
+            base_model = model.paths_collection.get_member(str(base))
+            if base_model is not None:
+                _collect_sources(base_model, sources, seen)
@@ -0,0 +1,871 @@
+"""Collection of MATLAB objects from the MATLAB search path, with support for caching."""
+
+from __future__ import annotations
+
+import codecs
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from importlib.metadata import version
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, NamedTuple
+
+import charset_normalizer
+from maxx.collection import (
+    CLASSFOLDER_PREFIX,
+    CONTENTS_FILE,
+    FOLDER_PREFIXES,
+    MFILE_SUFFIX,
+    NAMESPACE_PREFIX,
+    LinesCollection,
+    PathsCollection,
+    _PathResolver,
+)
+from maxx.config import ParserConfig
+from maxx.logger import LogLevel
+from maxx.logger import configure as configure_maxx_logger
+from maxx.objects import Alias
+from maxx.treesitter import FileParser
+from mkdocstrings import get_logger
+from tree_sitter import Node
+
+from mkdocstrings_handlers.matlab.hierarchy import HierarchyIndex
+from mkdocstrings_handlers.matlab.walker import PathWalker
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    from maxx.objects import Object
+
+__all__ = ["LazyLinesCollection", "MatlabPathsCollection", "ParseCache"]
+
+_logger = get_logger(__name__)
+
+_CACHE_VERSION = 1
+"""Version of the on-disk cache format, bump when the layout of an entry changes."""
+_FOLDER_FILES = (CONTENTS_FILE, "README.md", "readme.md")
+_MIN_FILES_PER_WORKER = 64
+"""The number of files to parse per worker process below which files are parsed serially.
+
+Models parsed in workers are unpickled in the main process, which takes about a tenth of
+the time of parsing them, so each worker has to parse enough files to pay for starting it.
+"""
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf_32"),
+    (codecs.BOM_UTF32_BE, "utf_32"),
+    (codecs.BOM_UTF8, "utf_8"),
+    (codecs.BOM_UTF16_LE, "utf_16"),
+    (codecs.BOM_UTF16_BE, "utf_16"),
+)
+"""Byte order marks and the encodings they identify, longest first, named as by `charset_normalizer`."""
+
+
+class _NodeText(NamedTuple):
+    """Stand-in for a tree-sitter node of a cached model, keeping only its source text."""
+
+    text: bytes | None
+
+
+class _ModelPickler(pickle.Pickler):
+    """Pickler that leaves out the paths collection and tree-sitter nodes of a model."""
+
+    def persistent_id(self, obj: Any) -> Any:
+        if isinstance(obj, PathsCollection):
+            return "paths_collection"
+        if isinstance(obj, Node):
+            # Expressions only ever read the text of their nodes.
+            return ("node", obj.text)
+        return None
+
+
+class _ModelUnpickler(pickle.Unpickler):
+    """Unpickler that reattaches a model to the paths collection it is loaded into."""
+
+    def __init__(self, file: BinaryIO, paths_collection: PathsCollection) -> None:
+        super().__init__(file)
+        self._paths_collection = paths_collection
+
+    def persistent_load(self, pid: Any) -> Any:
+        if pid == "paths_collection":
+            return self._paths_collection
+        return _NodeText(pid[1])
+
+
+def _dumps_model(model: Object) -> bytes:
+    buffer = io.BytesIO()
+    _ModelPickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(model)
+    return buffer.getvalue()
+
+
+def _loads_model(data: bytes, paths_collection: PathsCollection) -> Object:
+    return _ModelUnpickler(io.BytesIO(data), paths_collection).load()
+
+
+def _detect_encoding(content: bytes, hint: str | None = None) -> str:
+    """Detect the encoding of the content of a MATLAB file.
+
+    Byte order marks, ASCII and UTF-8 are checked first, as most files are encoded in them.
+    Other encodings are detected by `charset_normalizer`, which is much slower.
+
+    Parameters:
+        content: The content of the file.
+        hint: An encoding the file was decoded with before, tried before detecting the encoding.
+
+    Returns:
+        The encoding.
+    """
+    for bom, encoding in _BOMS:
+        if content.startswith(bom):
+            return encoding
+    if content.isascii():
+        return "ascii"
+    for encoding in ("utf_8", hint):
+        if encoding is None:
+            continue
+        try:
+            content.decode(encoding)
+        except (UnicodeDecodeError, LookupError):
+            continue
+        return encoding
+    result = charset_normalizer.from_bytes(content).best()
+    return result.encoding if result else "utf-8"
+
+
+class _FileParser(FileParser):
+    """File parser that detects the encoding of files with `_detect_encoding`."""
+
+    def __init__(
+        self,
+        filepath: Path,
+        paths_collection: PathsCollection | None = None,
+        encoding_hint: str | None = None,
+    ) -> None:
+        # Not calling `FileParser.__init__`, which always runs `charset_normalizer`.
+        self.filepath = filepath
+        self.paths_collection = paths_collection
+        self._content = filepath.read_bytes()
+        self.encoding = _detect_encoding(self._content, encoding_hint)
+        self._node = None
+
+
+def _available_cpus() -> int:
+    """Return the number of CPUs the current process can run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def _initialize_worker(log_level: LogLevel) -> None:
+    configure_maxx_logger(level=log_level)
+
+
+def _parse_file(
+    path: Path, parser_config: ParserConfig
+) -> tuple[bytes, str, bytes, tuple[int, int]] | None:
+    """Parse a MATLAB file in a worker process.
+
+    Parameters:
+        path: The path of the MATLAB file.
+        parser_config: The configuration used to parse the file.
+
+    Returns:
+        The pickled model, the encoding, the content and the size and modification time
+            of the file, or `None` if the file could not be parsed. Such files are parsed
+            again in the main process, so that errors are reported as in a serial parse.
+    """
+    try:
+        stat = path.stat()
+        paths_collection = PathsCollection()
+        file = _FileParser(path, paths_collection=paths_collection)
+        model = file.parse(config=parser_config, paths_collection=paths_collection)
+        return (
+            _dumps_model(model),
+            file.encoding,
+            file._content,
+            (stat.st_size, stat.st_mtime_ns),
+        )
+    except Exception:  # noqa: BLE001
+        return None
+
+
+class ParseCache:
+    """On-disk cache of the models parsed from MATLAB files.
+
+    Every file gets its own cache entry, holding the parsed model together with the
+    encoding, size, modification time and content digest of the file it was parsed from.
+    An entry is reused when the size and modification time of the file are unchanged,
+    or otherwise when its content is unchanged. Entries are only valid for the parser
+    configuration and `maxx` version they were created with.
+    """
+
+    def __init__(self, directory: Path, parser_config: ParserConfig) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            directory: The directory to store the cache entries in.
+            parser_config: The configuration used to parse the MATLAB files.
+        """
+        self.directory = directory
+        """The directory holding the cache entries."""
+        self._fingerprint = f"{_CACHE_VERSION}:{version('maxx')}:{parser_config!r}"
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, path: Path) -> Path:
+        return self.directory / f"{hashlib.sha256(str(path).encode()).hexdigest()}.pickle"
+
+    def load(
+        self, path: Path, paths_collection: PathsCollection
+    ) -> tuple[Object, str, bytes] | None:
+        """Load the cached model of a file.
+
+        Parameters:
+            path: The path of the MATLAB file.
+            paths_collection: The paths collection to attach the model to.
+
+        Returns:
+            The model, the encoding and the content of the file, or `None` if the file
+                is not cached or has changed since.
+        """
+        try:
+            with self._entry(path).open("rb") as file:
+                header = pickle.load(file)
+                if header["fingerprint"] != self._fingerprint:
+                    return None
+                stat = path.stat()
+                content = path.read_bytes()
+                if (stat.st_size, stat.st_mtime_ns) != header["stat"] and (
+                    hashlib.sha256(content).hexdigest() != header["digest"]
+                ):
+                    return None
+                model = _ModelUnpickler(file, paths_collection).load()
+        except FileNotFoundError:
+            return None
+        except Exception as error:  # noqa: BLE001
+            _logger.debug(f"Ignoring unreadable parse cache entry for {path}: {error}")
+            return None
+        return model, header["encoding"], content
+
+    def encoding(self, path: Path) -> str | None:
+        """Return the encoding a file was decoded with when it was last cached.
+
+        Parameters:
+            path: The path of the MATLAB file.
+
+        Returns:
+            The encoding, or `None` if the file is not cached.
+        """
+        try:
+            with self._entry(path).open("rb") as file:
+                return pickle.load(file)["encoding"]
+        except Exception:  # noqa: BLE001
+            return None
+
+    def dump(
+        self, path: Path, data: bytes, encoding: str, content: bytes, stat: tuple[int, int]
+    ) -> None:
+        """Store the model of a file in the cache.
+
+        Parameters:
+            path: The path of the MATLAB file.
+            data: The pickled model parsed from the file.
+            encoding: The encoding the file was decoded with.
+            content: The content the model was parsed from.
+            stat: The size and modification time of the file, taken before its content was read.
+        """
+        header = {
+            "fingerprint": self._fingerprint,
+            "stat": stat,
+            "digest": hashlib.sha256(content).hexdigest(),
+            "encoding": encoding,
+        }
+        # Write to a temporary file first so that concurrent builds never read partial entries.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(header, file, protocol=pickle.HIGHEST_PROTOCOL)
+                file.write(data)
+            os.replace(tmp, self._entry(path))
+        except Exception as error:  # noqa: BLE001
+            _logger.debug(f"Could not write parse cache entry for {path}: {error}")
+            Path(tmp).unlink(missing_ok=True)
+
+
+class LazyLinesCollection(LinesCollection):
+    """Lines collection that reads the lines of files when they are accessed.
+
+    Only the size, modification time and encoding of the parsed files are kept. Their lines
+    are read and decoded again when needed, and the lines of the most recently used files
+    are kept in memory. Lines set directly are kept as in a regular lines collection.
+    """
+
+    def __init__(self, maxsize: int = 64) -> None:
+        """Initialize the collection.
+
+        Parameters:
+            maxsize: The maximum number of files whose lines are kept in memory,
+                the least recently used are evicted first.
+        """
+        super().__init__()
+        self.maxsize = maxsize
+        """The maximum number of files whose lines are kept in memory."""
+        self._files: dict[Path, tuple[int, int, str]] = {}
+        self._recent: OrderedDict[tuple[Path, int, int, str], list[str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, path: Path, encoding: str, stat: tuple[int, int]) -> None:
+        """Register a file whose lines are read when accessed.
+
+        Parameters:
+            path: The path of the file.
+            encoding: The encoding the file was decoded with when parsed.
+            stat: The size and modification time of the file when parsed.
+        """
+        self._data.pop(path, None)
+        self._files[path] = (*stat, encoding)
+
+    def discard(self, path: Path) -> None:
+        """Forget the lines of a file.
+
+        Parameters:
+            path: The path of the file.
+        """
+        self._data.pop(path, None)
+        self._files.pop(path, None)
+
+    def __getitem__(self, key: Path) -> list[str]:
+        """Get the lines of a file path, reading them if they are not in memory."""
+        if key in self._data:
+            return self._data[key]
+        entry = (key, *self._files[key])
+        with self._lock:
+            lines = self._recent.get(entry)
+            if lines is not None:
+                self._recent.move_to_end(entry)
+                return lines
+
+        stat = key.stat()
+        if (stat.st_size, stat.st_mtime_ns) != entry[1:3]:
+            _logger.debug(f"{key} changed since it was parsed, its source may be out of date")
+        lines = key.read_bytes().decode(entry[3], errors="replace").split("\n")
+        with self._lock:
+            # Another thread may have read the file meanwhile, share its lines.
+            lines = self._recent.setdefault(entry, lines)
+            self._recent.move_to_end(entry)
+            while len(self._recent) > self.maxsize:
+                self._recent.popitem(last=False)
+        return lines
+
+    def __setitem__(self, key: Path, value: list[str]) -> None:
+        """Set the lines of a file path, keeping them in memory."""
+        self._files.pop(key, None)
+        self._data[key] = value
+
+    def __contains__(self, item: Path) -> bool:
+        """Check if a file path is in the collection."""
+        return item in self._data or item in self._files
+
+    def __iter__(self) -> Iterator[Path]:
+        yield from self._data
+        yield from self._files
+
+    def keys(self) -> Any:
+        """Return the collection keys.
+
+        Returns:
+            The collection keys.
+        """
+        return self._data.keys() | self._files.keys()
+
+    def values(self) -> Any:
+        """Return the collection values, reading the lines of every file.
+
+        Returns:
+            The collection values.
+        """
+        return [self[path] for path in self]
+
+    def items(self) -> Any:
+        """Return the collection items, reading the lines of every file.
+
+        Returns:
+            The collection items.
+        """
+        return [(path, self[path]) for path in self]
+
+
+def _signature(path: Path, walker: PathWalker) -> tuple[int, ...]:
+    """Return the sizes and modification times a path is collected from.
+
+    Parameters:
+        path: The path of a file or folder.
+        walker: The walker that listed the path, telling which files exist without stating them.
+
+    Returns:
+        The size and modification time of a file, or of the files documenting a folder.
+    """
+    paths = [path / name for name in _FOLDER_FILES] if walker.is_dir(path) else [path]
+    signature: list[int] = []
+    for item in paths:
+        try:
+            stat = item.stat() if walker.exists(item) else None
+        except FileNotFoundError:
+            stat = None
+        signature.extend((-1, -1) if stat is None else (stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def _identifier(path: Path) -> str:
+    """Return the identifier of a MATLAB path, derived from its file and folder names only.
+
+    Parameters:
+        path: A MATLAB file, namespace folder or class folder.
+
+    Returns:
+        The identifier the path is registered under in a paths collection.
+    """
+    parts = [path.name[1:] if path.is_dir() else path.stem]
+    parent = path.parent
+    while parent.name[:1] in FOLDER_PREFIXES:
+        parts.append(parent.name[1:])
+        parent = parent.parent
+    identifier = ".".join(reversed(parts))
+    if path.is_dir() and path.name.startswith(NAMESPACE_PREFIX):
+        return NAMESPACE_PREFIX + identifier
+    return identifier
+
+
+class _MatlabPathResolver(_PathResolver):
+    """Path resolver that parses MATLAB files through the parse cache of its collection.
+
+    Members of namespaces and class folders only get their parent when their folder is
+    collected. The resolver therefore resolves the enclosing folder first, which resolves
+    this path in turn, so that members resolved on their own have the same paths as when
+    the whole collection is resolved at once.
+    """
+
+    _paths_collection: MatlabPathsCollection
+
+    def __init__(self, path: Path, paths_collection: MatlabPathsCollection) -> None:
+        super().__init__(path, paths_collection)
+        self._resolving = False
+
+    def __call__(self) -> Object | None:
+        if self._object is None and not self._resolving:
+            container = self._paths_collection._objects.get(self._path.parent)
+            if container is not None and not container.resolved:
+                self._resolving = True
+                try:
+                    _ = container.target
+                finally:
+                    self._resolving = False
+        return super().__call__()
+
+    def _collect_path(self, path: Path, **kwargs: Any) -> Object:
+        if path.suffix != MFILE_SUFFIX:
+            return super()._collect_path(path, **kwargs)
+
+        parse_cache = self._paths_collection.parse_cache
+        cached = self._paths_collection._prefetched.pop(path, None)
+        if cached or (parse_cache and (cached := parse_cache.load(path, self._paths_collection))):
+            model, encoding, content = cached
+            stat = path.stat()
+            self._paths_collection._add_lines(
+                path, encoding, content, (stat.st_size, stat.st_mtime_ns)
+            )
+            return model
+
+        stat = path.stat()
+        file = _FileParser(
+            path,
+            paths_collection=self._paths_collection,
+            encoding_hint=parse_cache and parse_cache.encoding(path),
+        )
+        model = file.parse(
+            config=self._paths_collection._parser_config,
+            paths_collection=self._paths_collection,
+            **kwargs,
+        )
+        self._paths_collection._add_lines(
+            path, file.encoding, file._content, (stat.st_size, stat.st_mtime_ns)
+        )
+        if parse_cache is not None:
+            parse_cache.dump(
+                path,
+                _dumps_model(model),
+                file.encoding,
+                file._content,
+                (stat.st_size, stat.st_mtime_ns),
+            )
+        return model
+
+
+class MatlabPathsCollection(PathsCollection):
+    """Paths collection that can reuse the models parsed in previous builds.
+
+    Behaves like [`maxx.collection.PathsCollection`][], except that files are parsed
+    through an optional [`ParseCache`][mkdocstrings_handlers.matlab.collection.ParseCache],
+    that in lazy mode files are only parsed when they are first resolved, that files
+    can be parsed in parallel by a pool of worker processes, and that the lines of files
+    can be read when they are accessed rather than kept in memory.
+    """
+
+    def __init__(
+        self,
+        matlab_path: Sequence[str | Path] = (),
+        *,
+        parse_cache: ParseCache | None = None,
+        lazy: bool = False,
+        lazy_lines: bool = False,
+        parse_workers: int = 0,
+        log_level: LogLevel = "WARNING",
+        walker: PathWalker | None = None,
+        _executor: Executor | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize the collection.
+
+        Parameters:
+            matlab_path: The MATLAB paths.
+            parse_cache: The cache of parsed models, if any.
+            lazy: Whether to index the paths by their file and folder names only,
+                and parse files when they are first resolved.
+            lazy_lines: Whether to read the lines of files when they are accessed,
+                see [`LazyLinesCollection`][mkdocstrings_handlers.matlab.collection.LazyLinesCollection].
+            parse_workers: The number of worker processes to parse files with, at most the
+                number of available CPUs. Files are parsed serially when fewer than 2
+                workers are available, in lazy mode, or when there are too few to parse.
+            log_level: The logging level of the worker processes.
+            walker: The walker listing the members of the paths, which also sets the
+                files and folders to leave out.
+            **kwargs: Keyword arguments passed on to `maxx.collection.PathsCollection`.
+        """
+        self.parse_cache = parse_cache
+        """The cache of parsed models."""
+        self.lazy = lazy
+        """Whether files are parsed when they are first resolved."""
+        self.lazy_lines = lazy_lines
+        """Whether the lines of files are read when they are accessed."""
+        self.walker = walker or PathWalker(Path.cwd())
+        """The walker listing the members of the paths."""
+        self._executor = _executor
+        self._prefetched: dict[Path, tuple[Object, str, bytes]] = {}
+        self._recursive: dict[Path, bool] = {}
+        self._signatures: dict[Path, dict[Path, tuple[int, ...]]] = {}
+        self._reuse: dict[Path, Alias] = {}
+        self._fingerprint: str | None = None
+        self._hierarchy: HierarchyIndex | None = None
+        self._canonical_paths: dict[str, str | None] = {}
+        # Whether paths are being added together, from the same folder listings.
+        self._walking = True
+        # Workers only pay off when they run on CPUs of their own.
+        parse_workers = min(parse_workers, _available_cpus())
+        if parse_workers < 2 or lazy or _executor is not None:
+            super().__init__(list(matlab_path), **kwargs)
+        else:
+            with ProcessPoolExecutor(
+                parse_workers, initializer=_initialize_worker, initargs=(log_level,)
+            ) as executor:
+                self._executor = executor
+                try:
+                    super().__init__(list(matlab_path), **kwargs)
+                finally:
+                    self._executor = None
+        self._walking = False
+
+    def _as_local_collection(self, path: Path) -> MatlabPathsCollection:
+        private_dir = path / "private"
+        collection = MatlabPathsCollection(
+            [private_dir] if private_dir.exists() else [],
+            parse_cache=self.parse_cache,
+            lazy=self.lazy,
+            lazy_lines=self.lazy_lines,
+            walker=self.walker,
+            recursive=False,
+            working_directory=path,
+            _local=True,
+            _executor=self._executor,
+            parser_config=self._parser_config,
+        )
+        collection._path.appendleft(path)
+        return collection
+
+    def _add_lines(self, path: Path, encoding: str, content: bytes, stat: tuple[int, int]) -> None:
+        """Add the lines of a parsed file to the lines collection.
+
+        Parameters:
+            path: The path of the file.
+            encoding: The encoding the file was decoded with.
+            content: The content the file was parsed from.
+            stat: The size and modification time of the file.
+        """
+        if isinstance(self.lines_collection, LazyLinesCollection):
+            self.lines_collection.add(path, encoding, stat)
+        else:
+            self.lines_collection[path] = content.decode(encoding, errors="replace").split("\n")
+
+    def _prefetch(self, paths: Sequence[Path]) -> None:
+        """Parse files in the worker processes, ahead of their resolution, when there are enough.
+
+        Parameters:
+            paths: The paths of the files to parse.
+        """
+        if self._executor is None:
+            return
+        paths = [path for path in paths if path.suffix == MFILE_SUFFIX]
+        if self.parse_cache is not None:
+            pending = []
+            for path in paths:
+                if cached := self.parse_cache.load(path, self):
+                    self._prefetched[path] = cached
+                else:
+                    pending.append(path)
+            paths = pending
+        workers = getattr(self._executor, "_max_workers", 1)
+        if len(paths) < _MIN_FILES_PER_WORKER * workers:
+            # Parsed serially when resolved.
+            return
+
+        results = self._executor.map(
+            _parse_file,
+            paths,
+            [self._parser_config] * len(paths),
+            chunksize=max(1, len(paths) // (4 * workers)),
+        )
+        for path, result in zip(paths, results):
+            if result is None:
+                continue
+            data, encoding, content, stat = result
+            self._prefetched[path] = (_loads_model(data, self), encoding, content)
+            if self.parse_cache is not None:
+                self.parse_cache.dump(path, data, encoding, content, stat)
+
+    def addpath(self, path: str | Path, to_end: bool = False, recursive: bool = False) -> None:
+        """Add a path to the search path.
+
+        Mirrors `maxx.collection.PathsCollection.addpath` rather than calling it, since
+        the latter resolves the path of every member while indexing it, and lists members
+        with its own globber. Members are listed by the [walker][mkdocstrings_handlers.matlab.walker.PathWalker]
+        instead, models of unchanged files are reused, files are parsed through
+        `_MatlabPathResolver` and the parse cache, and in lazy mode members are indexed by their file and folder names.
+
+        Unlike `maxx`, local collections are not merged into the members of class folders:
+        `Alias.members` returns a new dictionary on each access, so that merge leaves the
+        class folders unchanged, while it parses every class folder up front.
+
+        Parameters:
+            path: The path to be added.
+            to_end: Whether to add the path to the end of the search path.
+            recursive: Whether to add the subdirectories of the path as well.
+        """
+        path = Path(path)
+        if not self._walking and not self._local:
+            self.walker.revalidate()
+        if self.lazy_lines and not isinstance(self.lines_collection, LazyLinesCollection):
+            # Replaces the lines collection created by `PathsCollection`, before any file is parsed.
+            self.lines_collection = LazyLinesCollection()
+
+        if path in self._path:
+            self._path.remove(path)
+        if to_end:
+            self._path.append(path)
+        else:
+            self._path.appendleft(path)
+        self._recursive[path] = recursive
+        self._fingerprint = None
+        self._hierarchy = None
+        self._canonical_paths.clear()
+        signatures = self._signatures[path] = {}
+
+        new_members: list[Path] = []
+        parsed_members: list[Path] = []
+        for member in self.walker.members(
+            path, recursive=recursive, parse_live_scripts=self._parse_live_scripts
+        ):
+            signatures[member] = _signature(member, self.walker)
+            model = self._reuse.get(member)
+            if model is None:
+                model = Alias(member.stem, target=_MatlabPathResolver(member, self))
+                # Resolving a member may resolve its enclosing folder, which resolves the member again.
+                model._lock = threading.RLock()  # ty: ignore[invalid-assignment]
+                parsed_members.append(member)
+            self._objects[member] = model
+            new_members.append(member)
+        self._prefetch(parsed_members)
+
+        for member in new_members:
+            model = self._objects[member]
+            if (CLASSFOLDER_PREFIX + member.stem) == member.parent.name:
+                # The class file in a class folder is added via the class folder.
+                continue
+
+            if member.is_dir() and member.stem[0] not in FOLDER_PREFIXES:
+                self._folders[member] = model
+            else:
+                identifier = _identifier(member) if self.lazy else model.path
+                self._mapping[identifier].append(member)
+                self._members[path].append((identifier, member))
+
+            if not self._local and member.is_file():
+                if member.parent not in self._local_collections:
+                    self._local_collections[member.parent] = self._as_local_collection(
+                        member.parent
+                    )
+                local_collection = self._local_collections[member.parent]
+                local_collection._objects[member] = model
+                if member not in local_collection._mapping[member.stem]:
+                    local_collection._mapping[member.stem].append(member)
+
+        self._merged_namespaces.clear()
+
+    def rmpath(self, path: str | Path, recursive: bool = False) -> None:
+        """Remove a path from the search path.
+
+        Parameters:
+            path: The path to be removed.
+            recursive: Whether to remove the subdirectories of the path as well.
+        """
+        super().rmpath(path, recursive=recursive)
+        self._fingerprint = None
+        self._hierarchy = None
+        self._canonical_paths.clear()
+
+    @property
+    def fingerprint(self) -> str:
+        """A digest of the identifiers on the search path and the paths they resolve to."""
+        if self._fingerprint is None:
+            hasher = hashlib.sha256()
+            for identifier, paths in sorted(self._mapping.items()):
+                if paths:
+                    hasher.update(f"{identifier}\0{paths[0]}\0".encode())
+            self._fingerprint = hasher.hexdigest()
+        return self._fingerprint
+
+    @property
+    def hierarchy(self) -> HierarchyIndex:
+        """The index of the class hierarchy, built again when the search path changes."""
+        if self._hierarchy is None:
+            self._hierarchy = HierarchyIndex(self)
+        return self._hierarchy
+
+    def canonical_path(self, identifier: str) -> str | None:
+        """Get the canonical path of the member an identifier resolves to.
+
+        Identifiers are resolved once until the search path changes, as type names and
+        defaults repeat across the signatures of a whole API.
+
+        Parameters:
+            identifier: The identifier, like a type name in an expression.
+
+        Returns:
+            The canonical path of the member, or `None` if the identifier does not resolve.
+        """
+        try:
+            return self._canonical_paths[identifier]
+        except KeyError:
+            pass
+        try:
+            member = self.get_member(identifier)
+        except KeyError:
+            member = None
+        path = self._canonical_paths[identifier] = None if member is None else member.canonical_path
+        return path
+
+    def refresh(self) -> set[Path]:
+        """Collect again the files and folders that changed since they were added.
+
+        Only the folders whose members were added, removed or renamed are listed again, see
+        [`PathWalker.revalidate`][mkdocstrings_handlers.matlab.walker.PathWalker.revalidate].
+        Paths are compared by their size and modification time, or for folders by those of
+        their `Contents.m` and `README.md` files. Changed, added and removed paths are
+        collected again together with the folders containing them. When a class folder is
+        collected again, so are all of its files, as its class file holds the methods defined
+        in the folder. Other objects are kept as they are.
+
+        Returns:
+            The paths that were collected again or removed.
+        """
+        refreshed: set[Path] = set()
+        if not self._local:
+            # Only the folders with added, removed or renamed members are listed again.
+            self.walker.revalidate()
+        self._walking = True
+        try:
+            for root in list(self._signatures):
+                previous = self._signatures[root]
+                if not root.is_dir():
+                    self.rmpath(root)
+                    self._remove(previous.keys())
+                    del self._signatures[root]
+                    refreshed.update(previous)
+                    continue
+
+                current = {
+                    member: _signature(member, self.walker)
+                    for member in self.walker.members(
+                        root,
+                        recursive=self._recursive[root],
+                        parse_live_scripts=self._parse_live_scripts,
+                    )
+                }
+                members = previous.keys() | current.keys()
+                stale = {
+                    member for member in members if previous.get(member) != current.get(member)
+                }
+                if not stale:
+                    continue
+                for member in list(stale):
+                    for parent in member.parents:
+                        if parent not in members:
+                            break
+                        stale.add(parent)
+                for folder in [member for member in stale if member.name[0] == CLASSFOLDER_PREFIX]:
+                    stale.update(member for member in members if member.parent == folder)
+
+                position = self._path.index(root)
+                local_collection = self._local_collections.get(root)
+                self._reuse = {member: self._objects[member] for member in current.keys() - stale}
+                self.rmpath(root)
+                if local_collection is not None:
+                    self._local_collections[root] = local_collection
+                self._remove(stale)
+                try:
+                    self.addpath(root, recursive=self._recursive[root])
+                finally:
+                    self._reuse = {}
+                self._path.remove(root)
+                self._path.insert(position, root)
+                refreshed.update(stale)
+
+            for collection in self._local_collections.values():
+                if isinstance(collection, MatlabPathsCollection):
+                    refreshed.update(collection.refresh())
+        finally:
+            self._walking = False
+        return refreshed
+
+    def _remove(self, paths: Iterable[Path]) -> None:
+        """Remove the objects and lines collected from paths.
+
+        Parameters:
+            paths: The paths of the files and folders to remove.
+        """
+        for path in paths:
+            self._objects.pop(path, None)
+            self._folders.pop(path, None)
+            if isinstance(self.lines_collection, LazyLinesCollection):
+                self.lines_collection.discard(path)
+            else:
+                self.lines_collection._data.pop(path, None)
+            if path.exists():
+                continue
+            self._local_collections.pop(path, None)
+            local_collection = self._local_collections.get(path.parent)
+            if local_collection is not None:
+                local_collection._objects.pop(path, None)
+                if path in (mapping := local_collection._mapping.get(path.stem, ())):
+                    mapping.remove(path)
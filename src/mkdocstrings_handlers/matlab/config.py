@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
 import re
 import sys
-from dataclasses import field, fields
+from collections.abc import Mapping
+from dataclasses import field, fields, is_dataclass, replace
+from functools import cached_property
 from typing import TYPE_CHECKING, Annotated, Any, Literal
 
 from griffe._internal.docstrings.parsers import DocstringStyle
@@ -72,6 +75,40 @@ if TYPE_CHECKING:
     from collections.abc import MutableMapping
 
 
+def _canonical(value: Any) -> Any:
+    """Return a canonical, hashable form of an option value."""
+    if isinstance(value, re.Pattern):
+        return ("re.Pattern", value.pattern, value.flags)
+    if is_dataclass(value) and not isinstance(value, type):
+        return (
+            type(value).__name__,
+            *((item.name, _canonical(getattr(value, item.name))) for item in fields(value)),
+        )
+    if isinstance(value, Mapping):
+        return tuple(sorted((str(key), _canonical(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_canonical(item) for item in value), key=repr))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(item) for item in value)
+    return value
+
+
+def options_fingerprint(value: Any) -> str:
+    """Return a digest of options that only depends on their values.
+
+    Mappings are digested as given, before coercion, so a mapping and the options built
+    from it have different digests: use [`MatlabOptions.fingerprint`][mkdocstrings_handlers.matlab.config.MatlabOptions.fingerprint]
+    to compare built options.
+
+    Parameters:
+        value: The options, either as a dataclass or as a mapping of option names to values.
+
+    Returns:
+        The digest, equal for options that are equal.
+    """
+    return hashlib.sha256(repr(_canonical(value)).encode()).hexdigest()
+
+
 @dataclass(frozen=True, kw_only=True)
 class GoogleStyleOptions:
     """Google style docstring options."""
@@ -609,6 +646,28 @@ class MatlabInputOptions:
         ),
     ] = False
 
+    inheritance_diagram_max_depth: Annotated[
+        int | None,
+        Field(
+            group="docstrings",
+            description="""The maximum number of generations of ancestors to show in inheritance diagrams.
+
+            If none, show all ancestors.
+            """,
+        ),
+    ] = None
+
+    inheritance_diagram_max_breadth: Annotated[
+        int | None,
+        Field(
+            group="docstrings",
+            description="""The maximum number of base classes to show for each class in inheritance diagrams.
+
+            If none, show all base classes.
+            """,
+        ),
+    ] = None
+
     show_attributes: Annotated[
         bool,
         Field(
@@ -801,6 +860,34 @@ class MatlabOptions(MatlabInputOptions):
     summary: SummaryOption = field(default_factory=SummaryOption)
     """Whether to render summaries of namespaces, classes, functions (methods) and properties."""
 
+    @cached_property
+    def fingerprint(self) -> str:
+        """A digest of the option values, suitable as a key of caches depending on them."""
+        return options_fingerprint(self)
+
+    def __hash__(self) -> int:
+        return hash(self.fingerprint)
+
+    @cached_property
+    def _signature_types_variant(self) -> MatlabOptions:
+        return replace(self, show_signature_types=not self.show_signature_types)
+
+    def with_signature_types(self, show_signature_types: bool) -> MatlabOptions:
+        """Get these options with signature types shown or hidden.
+
+        The variant is built once and reused, so that signatures rendered with
+        an explicit annotations setting do not copy the options each time.
+
+        Parameters:
+            show_signature_types: Whether to show signature types.
+
+        Returns:
+            These options, or their variant with the other signature types setting.
+        """
+        if show_signature_types == self.show_signature_types:
+            return self
+        return self._signature_types_variant
+
     @classmethod
     def coerce(cls, **data: Any) -> MutableMapping[str, Any]:
         """Create an instance from a dictionary."""
@@ -842,7 +929,7 @@ class Inventory:
 
     @property
     def _config(self) -> dict[str, Any]:
-        return {"base": self.base, "domains": self.domains}
+        return {"base_url": self.base, "domains": self.domains}
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -864,6 +951,72 @@ class MatlabInputConfig:
         Field(description="Whether add all paths recursively."),
     ] = False
 
+    paths_exclude: Annotated[
+        list[str],
+        Field(description="Glob patterns of the files and folders to leave out of the paths."),
+    ] = field(default_factory=list)
+
+    paths_gitignore: Annotated[
+        bool,
+        Field(description="Whether to leave out the files and folders ignored by Git."),
+    ] = False
+
+    paths_max_depth: Annotated[
+        int | None,
+        Field(description="The maximum depth of the subfolders added by `paths_recursive`."),
+    ] = None
+
+    lazy_parsing: Annotated[
+        bool,
+        Field(
+            description="""Whether to parse MATLAB files only when they are first needed.
+
+            When false, all files on the MATLAB path are parsed when the handler is created.
+            When true, the MATLAB path is only indexed by file and folder names, and files are parsed
+            when an object is collected or rendered.
+            """,
+        ),
+    ] = False
+
+    lazy_lines: Annotated[
+        bool,
+        Field(
+            description="""Whether to read the source lines of MATLAB files only when they are needed.
+
+            When false, the lines of all parsed files are kept in memory for the whole build.
+            When true, only the size, modification time and encoding of the files are kept,
+            and their lines are read again when showing source code.
+            """,
+        ),
+    ] = False
+
+    cache_dir: Annotated[
+        str | None,
+        Field(
+            description="""A directory to cache parsed MATLAB files, compiled templates, inventories, highlighted code and rendered HTML in between builds.
+
+            Non-absolute paths are relative to the MkDocs configuration file.
+            Only files that changed since the previous build are parsed again,
+            only templates that changed are compiled again,
+            and only objects whose sources or options changed are rendered again.
+            """,
+        ),
+    ] = None
+
+    parse_workers: Annotated[
+        int,
+        Field(
+            description="""The number of worker processes to parse MATLAB files with.
+
+            At most one worker per available CPU is started. When fewer than 2 workers can
+            be started, files are parsed serially. Parsed models are sent back from the
+            workers pickled, and unpickling them takes about a tenth of the time of parsing
+            them, so small folders are parsed serially as well. Ignored when `lazy_parsing`
+            is enabled.
+            """,
+        ),
+    ] = 0
+
     options: Annotated[
         MatlabInputOptions,
         Field(description="Configuration options for collecting and rendering objects."),
@@ -923,3 +1076,17 @@ class MatlabConfig(MatlabInputConfig):
 
     inventories: list[Inventory] = field(default_factory=list)
     options: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def coerce(cls, **data: Any) -> MutableMapping[str, Any]:
+        """Coerce data."""
+        if "inventories" in data:
+            data["inventories"] = [
+                inventory
+                if isinstance(inventory, Inventory)
+                else Inventory(url=inventory)
+                if isinstance(inventory, str)
+                else Inventory(**inventory)
+                for inventory in data["inventories"]
+            ]
+        return super().coerce(**data)
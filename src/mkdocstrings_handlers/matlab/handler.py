@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
-from contextlib import suppress
-from dataclasses import asdict
+import hashlib
+import json
+import logging
+import posixpath
+from contextlib import ExitStack, contextmanager, suppress
+from dataclasses import asdict, fields
+from importlib.metadata import version
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, ClassVar
+from typing import TYPE_CHECKING, Any, BinaryIO, ClassVar
 
 from griffe import AliasResolutionError, Parser
-from maxx.collection import LinesCollection, PathsCollection
+from jinja2 import FileSystemBytecodeCache
+from maxx.collection import LinesCollection
 from maxx.config import ParserConfig
 from maxx.logger import configure as configure_maxx_logger
+from maxx.objects import Alias
 from mkdocs.exceptions import PluginError
 from mkdocstrings import (
     BaseHandler,
@@ -21,10 +28,14 @@ from mkdocstrings import (
 )
 
 from mkdocstrings_handlers.matlab import rendering
-from mkdocstrings_handlers.matlab.config import MatlabConfig, MatlabOptions
+from mkdocstrings_handlers.matlab.cache import HighlightCache, RenderCache, RenderedFragment
+from mkdocstrings_handlers.matlab.collection import MatlabPathsCollection, ParseCache
+from mkdocstrings_handlers.matlab.config import MatlabConfig, MatlabOptions, options_fingerprint
+from mkdocstrings_handlers.matlab.inventory import InventoryStore
+from mkdocstrings_handlers.matlab.walker import PathWalker
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, MutableMapping, Sequence
+    from collections.abc import Iterator, Mapping, MutableMapping, Sequence
 
     from markdown.core import Extension
     from mkdocs.config.defaults import MkDocsConfig
@@ -33,6 +44,72 @@ if TYPE_CHECKING:
 _logger = get_logger(__name__)
 
 
+def _qualname(obj: Any) -> str:
+    return (
+        f"{getattr(obj, '__module__', '')}.{getattr(obj, '__qualname__', type(obj).__qualname__)}"
+    )
+
+
+_MISSING = object()
+
+
+@contextmanager
+def _patching(obj: Any, name: str, value: Any) -> Iterator[None]:
+    """Set an attribute of an object while in the context, and restore it on exit.
+
+    Parameters:
+        obj: The object.
+        name: The name of the attribute.
+        value: The value of the attribute while in the context.
+    """
+    previous = vars(obj).get(name, _MISSING)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        if previous is _MISSING:
+            delattr(obj, name)
+        else:
+            setattr(obj, name, previous)
+
+
+class _WarningsRecorder(logging.Handler):
+    """Logging handler recording warnings as logger name, level and message."""
+
+    def __init__(self) -> None:
+        super().__init__(logging.WARNING)
+        self.warnings: list[tuple[str, int, str]] = []
+        self._records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Records propagating to several of the loggers the recorder is added to are seen once each.
+        if any(seen is record for seen in self._records):
+            return
+        self._records.append(record)
+        self.warnings.append((record.name, record.levelno, record.getMessage()))
+
+
+@contextmanager
+def _recording_warnings() -> Iterator[list[tuple[str, int, str]]]:
+    """Record the warnings logged while in the context.
+
+    Warnings are recorded from the MkDocs loggers, which strict builds count and which
+    do not propagate to the root logger when running MkDocs, and from the root logger.
+
+    Yields:
+        The list the logged warnings are appended to.
+    """
+    recorder = _WarningsRecorder()
+    loggers = [logging.getLogger("mkdocs"), logging.getLogger()]
+    for logger in loggers:
+        logger.addHandler(recorder)
+    try:
+        yield recorder.warnings
+    finally:
+        for logger in loggers:
+            logger.removeHandler(recorder)
+
+
 class MatlabHandler(BaseHandler):
     """The `MatlabHandler` class is a handler for processing Matlab code documentation."""
 
@@ -48,6 +125,18 @@ class MatlabHandler(BaseHandler):
     fallback_theme: ClassVar[str] = "material"
     """The fallback theme."""
 
+    _previous_builds: ClassVar[
+        dict[tuple[Any, ...], tuple[MatlabPathsCollection, HighlightCache]]
+    ] = {}
+    """The paths collection and highlight cache of the previous build, by configuration.
+
+    MkDocs creates handlers again on each build, e.g. when serving. The collection of the
+    previous build is refreshed rather than collected again, but only when the paths and
+    the whole handler configuration, options and inventories aside, are unchanged. Only
+    the most recent build is kept, so that the parsed tree of a previous configuration
+    is freed when serving with a changed configuration.
+    """
+
     def __init__(
         self,
         config: MatlabConfig,
@@ -79,6 +168,20 @@ class MatlabHandler(BaseHandler):
         self.config = config
         self.base_dir = base_dir
         self.global_options = config.options
+        # Options built so far, by digest of the merged global and local options as given,
+        # which avoids coercing them again, and by their `MatlabOptions.fingerprint`,
+        # so that option mappings coercing to the same options share one instance.
+        self._options_cache: dict[str, MatlabOptions] = {}
+        self._options_by_fingerprint: dict[str, MatlabOptions] = {}
+        # Objects collected during this build, by identifier and options fingerprint,
+        # objects resolved by identifier, and docstring parsers by options fingerprint.
+        self._collected: dict[tuple[str, str], CollectorItem] = {}
+        self._resolved: dict[str, Any] = {}
+        self._docstring_parsers: dict[str, tuple[Parser | None, dict[str, Any]]] = {}
+        # Members may have moved in their files since the previous build,
+        # and docstrings of the previous build belong to models that are gone.
+        rendering.member_order_cache.clear()
+        rendering.docstring_sections_cache.clear()
 
         configure_maxx_logger(level=config.tree_sitter_logging_level)
 
@@ -91,15 +194,20 @@ class MatlabHandler(BaseHandler):
                         f"override '{theme_dir.name}/<template>.html.jinja' instead",
                     )
 
-        if config.paths:
-            full_paths = []
-            for path in config.paths:
-                if "*" in path:
-                    full_paths.extend([d for d in base_dir.glob(path) if d.is_dir()])
-                else:
-                    full_paths.append((base_dir / path).resolve())
-        else:
-            full_paths = []
+        walker = PathWalker(
+            base_dir,
+            exclude=config.paths_exclude,
+            gitignore=config.paths_gitignore,
+            max_depth=config.paths_max_depth,
+        )
+        # Glob patterns are all expanded in a single walk.
+        globbed = iter(walker.expand([path for path in config.paths if "*" in path]))
+        full_paths = []
+        for path in config.paths:
+            if "*" in path:
+                full_paths.extend(next(globbed))
+            else:
+                full_paths.append((base_dir / path).resolve())
 
         if path_ids := [str(path) for path in full_paths if not path.is_dir()]:
             raise PluginError(
@@ -112,14 +220,116 @@ class MatlabHandler(BaseHandler):
             docstring_before_arguments=config.docstring_before_arguments,
             docstring_before_enumerations=config.docstring_before_enumerations,
         )
-        self._paths_collection: PathsCollection = PathsCollection(
-            full_paths,
-            recursive=config.paths_recursive,
-            working_directory=base_dir,
-            parser_config=parser_config,
+        parse_cache = (
+            ParseCache((base_dir / config.cache_dir / "parse").resolve(), parser_config)
+            if config.cache_dir
+            else None
+        )
+        highlight_dir = (
+            (base_dir / config.cache_dir / "highlight").resolve() if config.cache_dir else None
+        )
+        key = (
+            base_dir,
+            tuple(full_paths),
+            options_fingerprint(
+                {
+                    item.name: getattr(config, item.name)
+                    for item in fields(config)
+                    if item.name not in ("inventories", "options")
+                }
+            ),
+        )
+        if (previous := self._previous_builds.get(key)) is not None:
+            paths_collection, highlight_cache = previous
+            # Rebuilding, e.g. when serving: only collect the files that changed.
+            if refreshed := paths_collection.refresh():
+                _logger.debug(f"Collected {len(refreshed)} changed MATLAB paths again")
+        else:
+            self._previous_builds.clear()
+            paths_collection = MatlabPathsCollection(
+                full_paths,
+                recursive=config.paths_recursive,
+                working_directory=base_dir,
+                parser_config=parser_config,
+                parse_cache=parse_cache,
+                lazy=config.lazy_parsing,
+                lazy_lines=config.lazy_lines,
+                parse_workers=config.parse_workers,
+                log_level=config.tree_sitter_logging_level,
+                walker=walker,
+            )
+            highlight_cache = HighlightCache(highlight_dir)
+            self._previous_builds[key] = (paths_collection, highlight_cache)
+        self._paths_collection: MatlabPathsCollection = paths_collection
+        self._render_cache = (
+            RenderCache((base_dir / config.cache_dir / "render").resolve())
+            if config.cache_dir
+            else None
+        )
+        if config.cache_dir:
+            # Entries are keyed by template file and checked against the template source,
+            # so that overridden templates never reuse the bytecode of the original ones.
+            bytecode_dir = (base_dir / config.cache_dir / "templates").resolve()
+            bytecode_dir.mkdir(parents=True, exist_ok=True)
+            self.env.bytecode_cache = FileSystemBytecodeCache(str(bytecode_dir))
+        self._highlight_cache = highlight_cache
+        self._inventory_store = InventoryStore(
+            (base_dir / config.cache_dir / "inventories").resolve() if config.cache_dir else None
         )
+        self._templates_digest: str | None = None
         self._lines_collection: LinesCollection = self._paths_collection.lines_collection
 
+    def get_inventory_urls(self) -> list[tuple[str, dict[str, Any]]]:
+        """Return the URLs of the inventory files to download.
+
+        Inventories given by a file path, relative to the configuration file, are returned as
+        `file://` URLs, so that they are read from the file system. The configuration of each
+        inventory also holds the store of the handler, passed on to `load_inventory`.
+
+        Returns:
+            The URL and the configuration of each inventory.
+        """
+        return [
+            (
+                inventory.url
+                if "://" in inventory.url
+                else (self.base_dir / inventory.url).resolve().as_uri(),
+                {**inventory._config, "store": self._inventory_store},
+            )
+            for inventory in self.config.inventories
+        ]
+
+    @classmethod
+    def load_inventory(
+        cls,
+        in_file: BinaryIO,
+        url: str,
+        base_url: str | None = None,
+        domains: list[str] | None = None,
+        store: InventoryStore | None = None,
+        **kwargs: Any,  # noqa: ARG003
+    ) -> Iterator[tuple[str, str]]:
+        """Yield items and their URLs from an inventory file streamed from `in_file`.
+
+        Inventories are stored in the cache directory when one is set, see
+        [`InventoryStore`][mkdocstrings_handlers.matlab.inventory.InventoryStore].
+
+        Parameters:
+            in_file: The binary file-like object to read the inventory from.
+            url: The URL that this file is being streamed from (used to guess `base_url`).
+            base_url: The URL that this inventory's sub-paths are relative to.
+            domains: A list of domain strings to filter the inventory by, all domains if `None`.
+            store: The store of the inventories, see `get_inventory_urls`.
+            **kwargs: Ignore additional arguments passed from the config.
+
+        Yields:
+            Tuples of (item identifier, item URL).
+        """
+        if base_url is None:
+            base_url = posixpath.dirname(url)
+        for name, uri in (store or InventoryStore()).items(in_file, domains or ()):
+            yield name, posixpath.join(base_url, uri)
+
     def get_options(self, local_options: Mapping[str, Any]) -> HandlerOptions:
         """Get combined default, global and local options.
 
@@ -135,10 +345,16 @@ class MatlabHandler(BaseHandler):
             **local_options.get("extra", {}),
         }
         options = {**self.global_options, **local_options, "extra": extra}
+        key = options_fingerprint(options)
+        if (cached := self._options_cache.get(key)) is not None:
+            return cached
         try:
-            return MatlabOptions.from_data(**options)
+            built = MatlabOptions.from_data(**options)
         except Exception as error:
             raise PluginError(f"Invalid options: {error}") from error
+        built = self._options_by_fingerprint.setdefault(built.fingerprint, built)
+        self._options_cache[key] = built
+        return built
 
     def render(
         self, data: CollectorItem, options: MatlabOptions, *, locale: str | None = None
@@ -154,28 +370,158 @@ class MatlabHandler(BaseHandler):
             The rendered template as HTML.
         """
 
-        template_name = rendering.do_get_template(data)
-        template = self.env.get_template(template_name)
+        key = None
+        if self._render_cache is not None:
+            key = self._render_cache.key(
+                data,
+                options.fingerprint,
+                str(self.config.locale),
+                self._get_templates_digest(),
+                self._paths_collection.fingerprint,
+                self._get_page(),
+            )
+            if (fragment := self._render_cache.load(key)) is not None:
+                self._headings.extend(fragment.headings)
+                # Log the warnings of the original rendering again, so that strict builds still fail.
+                for name, level, message in fragment.warnings:
+                    logging.getLogger(name).log(level, message)
+                return fragment.html
+
+        first_heading = len(self._headings)
+        with _recording_warnings() as warnings:
+            template_name = rendering.do_get_template(data)
+            template = self.env.get_template(template_name)
+
+            if hasattr(data, "docstring") and data.docstring is not None:
+                rendering.do_parse_docstring(
+                    data.docstring, data.docstring.parser, data.docstring.parser_options
+                )
+
+            heading_level = options.heading_level
+
+            with (
+                self._recording_anchors() as anchors,
+                self._recording_links() as links,
+                rendering.do_stash_crossref.scope(),
+            ):
+                html = template.render(
+                    **{
+                        "config": options,
+                        data.kind.value: data,
+                        "heading_level": heading_level,
+                        "root": True,
+                        "locale": self.config.locale,
+                    },
+                )
+
+        # Anchors registered from Markdown in docstrings could not be registered again on a cache hit,
+        # and links made relative to the page would not be validated again by MkDocs.
+        if key is not None and not anchors and not links:
+            self._render_cache.dump(  # ty: ignore[possibly-missing-attribute]
+                key, RenderedFragment(html, self._headings[first_heading:], tuple(warnings))
+            )
+        return html
+
+    def _get_page(self) -> str:
+        """Return the source URI of the page being rendered, that docstring links are relative to.
 
-        if hasattr(data, "docstring") and data.docstring is not None:
-            data.docstring.parse()
+        Returns:
+            The URI, or an empty string outside of MkDocs.
+        """
+        if self._md is None or "relpath" not in self._md.treeprocessors:
+            return ""
+        file = getattr(self._md.treeprocessors["relpath"], "file", None)
+        return getattr(file, "src_uri", "")
 
-        heading_level = options.heading_level
+    def _get_templates_digest(self) -> str:
+        """Return a digest of the templates, filters and Markdown configuration used to render.
 
-        html = template.render(
-            **{
-                "config": options,
-                data.kind.value: data,
-                "heading_level": heading_level,
-                "root": True,
-                "locale": self.config.locale,
-            },
+        Returns:
+            The digest.
+        """
+        if self._templates_digest is None:
+            hasher = hashlib.sha256(Path(rendering.__file__).read_bytes())
+            for name in sorted(self.env.list_templates()):
+                source, _, _ = self.env.loader.get_source(self.env, name)  # ty: ignore[possibly-missing-attribute]
+                hasher.update(f"\0{name}\0{source}".encode())
+            hasher.update(f"\0{self.theme}\0{self._get_markdown_digest()}".encode())
+            self._templates_digest = hasher.hexdigest()
+        return self._templates_digest
+
+    def _get_markdown_digest(self) -> str:
+        """Return a digest of the Markdown configuration, which also configures highlighting.
+
+        Returns:
+            The digest.
+        """
+        extensions = [ext if isinstance(ext, str) else _qualname(ext) for ext in self.mdx]
+        return hashlib.sha256(
+            json.dumps(
+                [extensions, self.mdx_config, version("pygments"), version("pymdown-extensions")],
+                sort_keys=True,
+                default=_qualname,
+            ).encode()
+        ).hexdigest()
+
+    @contextmanager
+    def _recording_anchors(self) -> Iterator[list[str]]:
+        """Record the anchors registered to autorefs while converting Markdown.
+
+        The autorefs plugin is only patched while in the context.
+
+        Yields:
+            The list the registered anchors are appended to.
+        """
+        anchors: list[str] = []
+        plugins = {}
+        if self._md is not None:
+            for processor in self._md.treeprocessors:
+                plugin = getattr(processor, "_plugin", None)
+                if plugin is not None and hasattr(plugin, "register_anchor"):
+                    plugins[id(plugin)] = plugin
+
+        with ExitStack() as stack:
+            for plugin in plugins.values():
+
+                def register_anchor(
+                    page: Any,
+                    identifier: str,
+                    *args: Any,
+                    _register: Any = plugin.register_anchor,
+                    **kwargs: Any,
+                ) -> None:
+                    anchors.append(identifier)
+                    _register(page, identifier, *args, **kwargs)
+
+                stack.enter_context(_patching(plugin, "register_anchor", register_anchor))
+            yield anchors
+
+    @contextmanager
+    def _recording_links(self) -> Iterator[list[str]]:
+        """Record the links made relative to the current page by MkDocs while converting Markdown.
+
+        The MkDocs treeprocessor is only patched while in the context.
+
+        Yields:
+            The list the converted links are appended to.
+        """
+        links: list[str] = []
+        processor = (
+            self._md.treeprocessors["relpath"]
+            if self._md is not None and "relpath" in self._md.treeprocessors
+            else None
         )
+        path_to_url = getattr(processor, "path_to_url", None)
+        if path_to_url is None:
+            yield links
+            return
 
-        if self.env.filters["stash_crossref"].stash:  # ty: ignore[unresolved-attribute]
-            pass
+        def record_path_to_url(url: str) -> str:
+            links.append(url)
+            return path_to_url(url)
 
-        return html
+        with _patching(processor, "path_to_url", record_path_to_url):
+            yield links
 
     def update_env(self, config: Any) -> None:  # noqa: ARG002
         """Update the Jinja environment with custom filters and tests.
@@ -186,11 +532,21 @@ class MatlabHandler(BaseHandler):
         self.env.trim_blocks = True
         self.env.lstrip_blocks = True
         self.env.keep_trailing_newline = False
+        highlight = rendering.SourceHighlighter(self.md).highlight
+        highlight_namespace = self._get_markdown_digest()
+        self.env.filters["highlight"] = lambda *args, **kwargs: self._highlight_cache.highlight(
+            highlight,
+            highlight_namespace,
+            *args,
+            **kwargs,
+        )
+        self.env.filters["highlight_source"] = rendering.do_highlight_source
         self.env.filters["order_members"] = rendering.do_order_members
         self.env.filters["format_signature"] = rendering.do_format_signature
         self.env.filters["format_property"] = rendering.do_format_property
         self.env.filters["format_arguments"] = rendering.do_format_arguments
         self.env.filters["filter_objects"] = rendering.do_filter_objects
+        self.env.filters["partition_members"] = rendering.do_partition_members
         self.env.filters["stash_crossref"] = rendering.do_stash_crossref
         self.env.filters["get_template"] = rendering.do_get_template
         self.env.filters["function_docstring"] = rendering.do_function_docstring
@@ -202,6 +558,7 @@ class MatlabHandler(BaseHandler):
         self.env.filters["as_inheritance_diagram_section"] = (
             rendering.do_as_inheritance_diagram_section
         )
+        self.env.filters["canonical_path"] = self._paths_collection.canonical_path
         self.env.globals["AutorefsHook"] = rendering.AutorefsHook  # ty: ignore[invalid-assignment]
         self.env.tests["existing_template"] = lambda template_name: (  # ty: ignore[invalid-assignment]
             template_name in self.env.list_templates()
@@ -218,6 +575,8 @@ class MatlabHandler(BaseHandler):
         In the implementation, you typically call a subprocess that returns JSON, and load that JSON again into
         a Python dictionary for example, though the implementation is completely free.
 
+        Objects are resolved once per build and identifier, and reused when collected again.
+
         Arguments:
             identifier: An identifier for which to collect data.
             options: The handler's configuration options.
@@ -231,46 +590,128 @@ class MatlabHandler(BaseHandler):
         if options == {}:
             options = self.get_options({})
 
-        try:
-            if "/" in identifier:
-                # If the identifier contains a slash, it is a path to a file.
-                # We use the lines collection to get the model.
-                path = (self.base_dir / identifier).resolve()
-                if path in self._paths_collection._folders:
-                    # If the path is a folder, we return the folder model.
-                    model = self._paths_collection._folders[path]
-                else:
-                    raise CollectionError(
-                        f"Path '{identifier}' is not a valid path in the collection"
-                    )
-            else:
-                model = self._paths_collection.get_member(identifier)
-        except SyntaxError as ex:
-            msg = str(ex)
-            if ex.text:
-                msg += ":\n" + str(ex.text)
-            raise CollectionError(msg) from ex
-        except KeyError as ex:
-            raise CollectionError(str(ex)) from ex
-        except AliasResolutionError as ex:
-            raise CollectionError(str(ex)) from ex
-
+        key = (identifier, options.fingerprint)
+        model = self._collected.get(key)
         if model is None:
-            raise CollectionError(f"Identifier '{identifier}' not found")
-
-        parser_name = options.docstring_style
-        parser = parser_name and Parser(parser_name)
-        parser_options = options.docstring_options and asdict(
-            options.docstring_options  # ty: ignore[invalid-argument-type]
-        )
+            model = self._collected[key] = self._resolve(identifier)
 
+        # Set the parser on every call, as the same object may be collected with other options.
+        parser, parser_options = self._get_docstring_parser(options)
         with suppress(AliasResolutionError):
             if model.docstring is not None:
                 model.docstring.parser = parser
-                model.docstring.parser_options = parser_options or {}
+                model.docstring.parser_options = parser_options
+
+        return model
+
+    def collect_many(
+        self, identifiers: Sequence[str], options: MatlabOptions
+    ) -> list[CollectorItem]:
+        """Collect the objects of several identifiers.
+
+        The namespaces and classes containing the objects are resolved first, parents
+        before children, so that each of them is only resolved once for all identifiers.
+
+        Parameters:
+            identifiers: The identifiers to collect data for.
+            options: The handler's configuration options.
+
+        Returns:
+            The collected objects, in order.
 
+        Raises:
+            CollectionError: When an identifier cannot be collected.
+        """
+        parents = {
+            ".".join(parts[:index])
+            for identifier in identifiers
+            if "/" not in identifier
+            for parts in [identifier.split(".")]
+            for index in range(1, len(parts))
+        }
+        for parent in sorted(parents, key=lambda parent: parent.count(".")):
+            with suppress(CollectionError):
+                self._resolve(parent)
+        return [self.collect(identifier, options) for identifier in identifiers]
+
+    def _get_docstring_parser(self, options: MatlabOptions) -> tuple[Parser | None, dict[str, Any]]:
+        """Return the docstring parser and parser options of the given options.
+
+        Parameters:
+            options: The handler's configuration options.
+
+        Returns:
+            The parser and its options, reused for options with the same fingerprint.
+        """
+        parser = self._docstring_parsers.get(options.fingerprint)
+        if parser is None:
+            parser_name = options.docstring_style
+            parser_options = options.docstring_options and asdict(
+                options.docstring_options  # ty: ignore[invalid-argument-type]
+            )
+            parser = self._docstring_parsers[options.fingerprint] = (
+                parser_name and Parser(parser_name),
+                parser_options or {},
+            )
+        return parser
+
+    def _resolve(self, identifier: str) -> Any:
+        """Resolve an identifier to an object, reusing the objects resolved during this build.
+
+        Parameters:
+            identifier: The identifier, or the path of a folder relative to the configuration file.
+
+        Returns:
+            The object.
+
+        Raises:
+            CollectionError: When the identifier cannot be resolved.
+        """
+        if identifier in self._resolved:
+            model = self._resolved[identifier]
+        else:
+            try:
+                model = self._lookup(identifier)
+            except SyntaxError as ex:
+                msg = str(ex)
+                if ex.text:
+                    msg += ":\n" + str(ex.text)
+                raise CollectionError(msg) from ex
+            except KeyError as ex:
+                raise CollectionError(str(ex)) from ex
+            except AliasResolutionError as ex:
+                raise CollectionError(str(ex)) from ex
+            self._resolved[identifier] = model
+
+        if model is None:
+            raise CollectionError(f"Identifier '{identifier}' not found")
         return model
 
+    def _lookup(self, identifier: str) -> Any:
+        if "/" in identifier:
+            # If the identifier contains a slash, it is a path to a file.
+            # We use the lines collection to get the model.
+            path = (self.base_dir / identifier).resolve()
+            if path in self._paths_collection._folders:
+                # If the path is a folder, we return the folder model.
+                return self._paths_collection._folders[path]
+            raise CollectionError(f"Path '{identifier}' is not a valid path in the collection")
+
+        parent, _, name = identifier.rpartition(".")
+        if not parent or identifier in self._paths_collection._mapping:
+            return self._paths_collection.get_member(identifier)
+        # Members are looked up in their parent as by `PathsCollection.__getitem__`,
+        # reusing the parent when it was resolved before.
+        if parent in self._resolved:
+            base = self._resolved[parent]
+        else:
+            base = self._resolved[parent] = self._lookup(parent)
+        if base is None or name not in base.members:
+            # The collection may still find the identifier, e.g. through a local collection.
+            return self._paths_collection.get_member(identifier)
+        model = base.members[name]
+        return model.target if isinstance(model, Alias) else model
+
 
 def get_handler(
     handler_config: MutableMapping[str, Any],
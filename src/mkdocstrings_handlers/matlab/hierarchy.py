@@ -0,0 +1,183 @@
+"""Index of the class hierarchy of a paths collection."""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING
+
+from maxx.objects import Class
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from maxx.collection import PathsCollection
+
+__all__ = ["HierarchyIndex"]
+
+Node = Class | str
+"""A class of the hierarchy, or the name of a base class outside of the paths collection."""
+
+
+def _key(node: Node) -> str:
+    return node if isinstance(node, str) else getattr(node, "path", node.name)
+
+
+def _label(node: Node) -> str:
+    return node if isinstance(node, str) else node.name
+
+
+def _node_id(node: Node) -> str:
+    return _label(node).replace(".", "_")
+
+
+class HierarchyIndex:
+    """Index of the base classes of the classes in a paths collection.
+
+    The base classes of a class are resolved once. Its ancestors, its descendants and its
+    inheritance diagrams are computed from them when first needed, and reused afterwards.
+    The index is not updated when the paths collection changes: build a new index instead.
+    """
+
+    def __init__(self, paths_collection: PathsCollection | None) -> None:
+        """Initialize the index.
+
+        Parameters:
+            paths_collection: The paths collection to resolve base classes in.
+        """
+        self.paths_collection = paths_collection
+        """The paths collection base classes are resolved in."""
+        # Entries are only ever added and are the same whichever thread computes them,
+        # so that concurrent renderers can share the index without locking.
+        self._parents: dict[str, tuple[Node, ...]] = {}
+        self._ancestors: dict[str, tuple[Node, ...]] = {}
+        self._children: dict[str, tuple[Class, ...]] | None = None
+        self._diagrams: dict[tuple[str, int | None, int | None], str | None] = {}
+
+    def parents(self, model: Class) -> tuple[Node, ...]:
+        """Return the base classes of a class.
+
+        Base classes that are not in the paths collection are returned by name,
+        and base classes that resolve to something else than a class are left out.
+
+        Parameters:
+            model: The class.
+
+        Returns:
+            The base classes, in the order they are declared.
+        """
+        parents = self._parents.get(_key(model))
+        if parents is None:
+            parents = self._parents.setdefault(_key(model), tuple(self._resolve_bases(model)))
+        return parents
+
+    def _resolve_bases(self, model: Class) -> Iterator[Node]:
+        for base in model.bases:
+            name = str(base)
+            parent = self.paths_collection.get_member(name) if self.paths_collection else None
+            if parent is None:
+                yield name
+            elif isinstance(parent, Class):
+                yield parent
+
+    def ancestors(self, model: Class) -> tuple[Node, ...]:
+        """Return the transitive base classes of a class.
+
+        Parameters:
+            model: The class.
+
+        Returns:
+            The ancestors, closest first.
+        """
+        ancestors = self._ancestors.get(_key(model))
+        if ancestors is None:
+            ancestors = self._ancestors.setdefault(
+                _key(model), tuple(self._walk(model, self.parents))
+            )
+        return ancestors
+
+    def descendants(self, model: Class) -> tuple[Class, ...]:
+        """Return the classes of the paths collection that inherit from a class.
+
+        The first call resolves every object of the paths collection.
+
+        Parameters:
+            model: The class.
+
+        Returns:
+            The descendants, closest first.
+        """
+        if self._children is None:
+            children: defaultdict[str, list[Class]] = defaultdict(list)
+            for identifier in list(getattr(self.paths_collection, "_mapping", ())):
+                member = self.paths_collection.get_member(identifier)  # ty: ignore[possibly-missing-attribute]
+                if isinstance(member, Class):
+                    for parent in self.parents(member):
+                        children[_key(parent)].append(member)
+            self._children = {key: tuple(classes) for key, classes in children.items()}
+        children_index = self._children
+        return tuple(self._walk(model, lambda node: children_index.get(_key(node), ())))  # ty: ignore[invalid-return-type]
+
+    @staticmethod
+    def _walk(model: Class, neighbours: Callable[[Class], tuple[Node, ...]]) -> Iterator[Node]:
+        seen = {_key(model)}
+        queue: deque[Node] = deque([model])
+        while queue:
+            node = queue.popleft()
+            if isinstance(node, str):
+                continue
+            for neighbour in neighbours(node):
+                if _key(neighbour) not in seen:
+                    seen.add(_key(neighbour))
+                    queue.append(neighbour)
+                    yield neighbour
+
+    def diagram(
+        self,
+        model: Class,
+        max_depth: int | None = None,
+        max_breadth: int | None = None,
+    ) -> str | None:
+        """Return a Mermaid flowchart of the ancestors of a class.
+
+        Parameters:
+            model: The class.
+            max_depth: The maximum number of generations of ancestors to show.
+            max_breadth: The maximum number of base classes to show for each class.
+
+        Returns:
+            The Mermaid code block, or `None` if the class has no base classes to show.
+        """
+        key = (_key(model), max_depth, max_breadth)
+        if key not in self._diagrams:
+            self._diagrams[key] = self._build_diagram(model, max_depth, max_breadth)
+        return self._diagrams[key]
+
+    def _build_diagram(
+        self,
+        model: Class,
+        max_depth: int | None,
+        max_breadth: int | None,
+    ) -> str | None:
+        nodes: list[Node] = [model]
+        links: list[tuple[Node, Node]] = []
+        seen = {_key(model)}
+        queue: deque[tuple[Node, int]] = deque([(model, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if isinstance(node, str) or (max_depth is not None and depth >= max_depth):
+                continue
+            for parent in self.parents(node)[:max_breadth]:
+                links.append((parent, node))
+                if _key(parent) not in seen:
+                    seen.add(_key(parent))
+                    nodes.append(parent)
+                    queue.append((parent, depth + 1))
+        if len(nodes) == 1:
+            return None
+
+        lines = [
+            "flowchart TB",
+            *(f"   {_node_id(node)}[{_label(node)}]" for node in nodes),
+            *(f"   {_node_id(parent)} --> {_node_id(child)}" for parent, child in links),
+        ]
+        return "```mermaid\n" + "\n".join(lines) + "\n```"
@@ -0,0 +1,102 @@
+"""On-disk store of the items of the inventories loaded by the handler."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+from contextlib import closing
+from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
+
+from mkdocstrings import Inventory, get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Iterator
+
+__all__ = ["InventoryStore"]
+
+_logger = get_logger(__name__)
+
+_STORE_VERSION = 1
+"""Version of the layout of the stored inventories, bump when it changes."""
+
+_CHUNK_SIZE = 1 << 16
+"""Size of the chunks inventory files are read in to find their digest."""
+
+
+class InventoryStore:
+    """Store of the items of inventories, indexed by domain.
+
+    Inventories are stored by the digest of their content, as SQLite databases, so that
+    an inventory is only decompressed and parsed the first time it is loaded.
+    Without a directory, inventories are parsed each time they are loaded.
+    """
+
+    def __init__(self, directory: Path | None = None) -> None:
+        """Initialize the store.
+
+        Parameters:
+            directory: The directory to store the inventories in, if any.
+        """
+        self.directory = directory
+        """The directory holding the stored inventories, if any."""
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def items(self, in_file: BinaryIO, domains: Collection[str] = ()) -> Iterator[tuple[str, str]]:
+        """Yield the items of an inventory.
+
+        Parameters:
+            in_file: The binary file-like object to read the Sphinx inventory from.
+                It is read in chunks to find its digest, and read again from the start
+                to parse it when it is not stored yet, so it must be seekable.
+            domains: The domains of the items to yield, or all domains if empty.
+
+        Yields:
+            The name and the URI of each item, in the order of the inventory.
+        """
+        if self.directory is None:
+            inventory = Inventory.parse_sphinx(in_file, domain_filter=domains)
+            for item in inventory.values():
+                yield item.name, item.uri
+            return
+
+        start = in_file.tell()
+        hasher = hashlib.sha256()
+        while chunk := in_file.read(_CHUNK_SIZE):
+            hasher.update(chunk)
+        path = self.directory / f"{_STORE_VERSION}-{hasher.hexdigest()}.sqlite"
+        if not path.exists():
+            in_file.seek(start)
+            self._dump(path, in_file)
+
+        query = "SELECT name, uri FROM items"
+        if domains:
+            query += f" WHERE domain IN ({', '.join('?' * len(domains))})"
+        with closing(sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True)) as connection:
+            yield from connection.execute(query + " ORDER BY position", tuple(domains))
+
+    def _dump(self, path: Path, in_file: BinaryIO) -> None:
+        inventory = Inventory.parse_sphinx(in_file)
+        # Write to a temporary file first so that concurrent builds never read partial stores.
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            with closing(sqlite3.connect(tmp)) as connection:
+                connection.execute(
+                    "CREATE TABLE items"
+                    " (position INTEGER PRIMARY KEY, domain TEXT, name TEXT, uri TEXT)"
+                )
+                connection.executemany(
+                    "INSERT INTO items (domain, name, uri) VALUES (?, ?, ?)",
+                    ((item.domain, item.name, item.uri) for item in inventory.values()),
+                )
+                connection.execute("CREATE INDEX items_domain ON items (domain, position)")
+                connection.commit()
+            os.replace(tmp, path)
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        _logger.debug(f"Stored inventory {path.name} with {len(inventory)} items")
@@ -6,10 +6,16 @@ import random
 import re
 import string
 import sys
-from contextlib import suppress
-from dataclasses import replace
+import threading
+import weakref
+from collections import ChainMap, OrderedDict
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import asdict, is_dataclass
+from functools import lru_cache
+from pathlib import Path
 from re import Pattern
-from typing import TYPE_CHECKING, Any, Callable, ClassVar, Literal, cast
+from typing import TYPE_CHECKING, Any, Callable, Literal, NamedTuple, cast
 
 from griffe import (
     AliasResolutionError,
@@ -33,19 +39,28 @@ from griffe._internal.docstrings.models import (
     DocstringSectionParameters,
     DocstringSectionReturns,
 )
-from griffe._internal.docstrings.parsers import DocstringStyle, parse
+from griffe._internal.docstrings.parsers import DocstringStyle, Parser, parse
 from jinja2 import pass_context
 from markupsafe import Markup
-from maxx.enums import ArgumentKind
+from maxx.enums import ArgumentKind, Kind
+from maxx.exceptions import FilePathError
 from maxx.objects import Alias, Class, Folder, Function, Namespace, Object, Property, Script
 from mkdocs_autorefs import AutorefsHookInterface
-from mkdocstrings import get_logger
+from mkdocstrings import Highlighter, get_logger
+
+from mkdocstrings_handlers.matlab.cache import SourceTokensCache
+from mkdocstrings_handlers.matlab.hierarchy import HierarchyIndex
 
 if TYPE_CHECKING:
-    from collections.abc import Iterator, Sequence
+    from collections.abc import Iterable, Iterator, Sequence
 
+    from jinja2 import Environment, Template
     from jinja2.runtime import Context
+    from maxx.expressions import Expr
     from mkdocstrings import CollectorItem
+    from pygments.lexer import Lexer
+
+    from mkdocstrings_handlers.matlab.config import MatlabOptions
 
     MEMBERS = Alias | Class | Folder | Function | Namespace | Property | Script
 
@@ -94,19 +109,61 @@ _order_map: dict[str, Callable[[Object | Alias], str | float]] = {
 }
 
 
+_STASH_KEY_PATTERN = re.compile(r"\b_\w+")
+"""Pattern matching the words that can be stash keys."""
+
+
+_crossref_stash: ContextVar[dict[str, str] | None] = ContextVar("crossref_stash", default=None)
+"""The cross-references stashed in the current scope, see `_StashCrossRefFilter.scope`."""
+
+_crossref_stash_depth: ContextVar[int] = ContextVar("crossref_stash_depth", default=0)
+"""The number of stash scopes entered in the current context, which seeds the stash keys."""
+
+
 class _StashCrossRefFilter:
-    stash: ClassVar[dict[str, str]] = {}
+    @property
+    def stash(self) -> dict[str, str]:
+        """The cross-references stashed in the current scope, by key."""
+        stash = _crossref_stash.get()
+        if stash is None:
+            stash = {}
+            _crossref_stash.set(stash)
+        return stash
+
+    @contextmanager
+    def scope(self) -> Iterator[dict[str, str]]:
+        """Stash cross-references in a new stash, discarded when leaving the scope.
+
+        Stashes are held in a context variable, so that concurrent renders and
+        nested formatting filters never see or clear each other's cross-references.
+
+        Yields:
+            The new stash.
+        """
+        stash: dict[str, str] = {}
+        token = _crossref_stash.set(stash)
+        depth_token = _crossref_stash_depth.set(_crossref_stash_depth.get() + 1)
+        try:
+            yield stash
+        finally:
+            _crossref_stash_depth.reset(depth_token)
+            _crossref_stash.reset(token)
 
     @staticmethod
-    def _gen_key(length: int) -> str:
+    def _gen_key(length: int, generator: random.Random) -> str:
         return "_" + "".join(
-            random.choice(string.ascii_letters + string.digits) for _ in range(max(1, length - 1))
-        )  # noqa: S311
+            generator.choice(string.ascii_letters + string.digits)
+            for _ in range(max(1, length - 1))
+        )
 
     def _gen_stash_key(self, length: int) -> str:
-        key = self._gen_key(length)
+        # Keys are pseudo-random but seeded by the scope depth and the number of stashed
+        # cross-references, so that the same signatures give the same highlighted text on
+        # every build and hit the highlight cache, while nested scopes get different keys.
+        generator = random.Random(f"{_crossref_stash_depth.get()}:{len(self.stash)}")  # noqa: S311
+        key = self._gen_key(length, generator)
         while key in self.stash:
-            key = self._gen_key(length)
+            key = self._gen_key(length, generator)
         return key
 
     def __call__(self, crossref: str, *, length: int) -> str:
@@ -114,11 +171,298 @@ class _StashCrossRefFilter:
         self.stash[key] = crossref
         return key
 
+    def unstash(self, text: str) -> str:
+        """Restore the stashed cross-references in a text, and clear the stash.
+
+        Keys are whole words starting with an underscore. They are all replaced in a
+        single scan over the words of the text, so that the time taken only grows
+        linearly with the length of the text.
+
+        Parameters:
+            text: The text containing stash keys.
+
+        Returns:
+            The text with the keys replaced by their cross-references.
+        """
+        if not self.stash:
+            return text
+        stash = dict(self.stash)
+        self.stash.clear()
+        return _STASH_KEY_PATTERN.sub(lambda match: stash.get(match[0], match[0]), text)
+
 
 do_stash_crossref = _StashCrossRefFilter()
 """Filter to stash cross-references (and restore them after formatting and highlighting)."""
 
 
+source_tokens_cache = SourceTokensCache()
+"""The cache of the tokens of source files used by [`SourceHighlighter`][mkdocstrings_handlers.matlab.rendering.SourceHighlighter]."""
+
+_source_location: ContextVar[tuple[Path, list[str], int, int] | None] = ContextVar(
+    "source_location", default=None
+)
+"""The file, lines and line range of the source code being highlighted, see `do_highlight_source`."""
+
+
+class _SlicedLexer:
+    """Lexer returning tokens sliced from the tokens of a whole file.
+
+    Other attributes are those of the wrapped lexer.
+    """
+
+    def __init__(self, lexer: Lexer, location: tuple[Path, list[str], int, int]) -> None:
+        self._lexer = lexer
+        self._location = location
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._lexer, name)
+
+    def _preprocess(self, text: str) -> str:
+        """Prepare a text as the lexer does before lexing it, following its public options.
+
+        Parameters:
+            text: The text.
+
+        Returns:
+            The text the lexer would lex.
+        """
+        lexer = self._lexer
+        text = text.removeprefix("\ufeff").replace("\r\n", "\n").replace("\r", "\n")
+        if lexer.stripall:
+            text = text.strip()
+        elif lexer.stripnl:
+            text = text.strip("\n")
+        if lexer.tabsize > 0:
+            text = text.expandtabs(lexer.tabsize)
+        if lexer.ensurenl and not text.endswith("\n"):
+            text += "\n"
+        return text
+
+    def get_tokens(self, text: str, unfiltered: bool = False) -> Iterator[tuple[Any, str]]:  # noqa: FBT001, FBT002
+        tokens = source_tokens_cache.slice(self._lexer, *self._location)
+        # The sliced tokens are only used for the exact text they were sliced from,
+        # e.g. not when the lexer strips the text differently.
+        if self._preprocess(text) != "".join(value for _, value in tokens):
+            return self._lexer.get_tokens(text, unfiltered)
+        return iter(tokens)
+
+
+class SourceHighlighter(Highlighter):
+    """Highlighter that lexes each source file once.
+
+    When highlighting the source code of an object with
+    [`do_highlight_source`][mkdocstrings_handlers.matlab.rendering.do_highlight_source],
+    the whole file is lexed and its tokens are cached, so that the source code of the other
+    objects of the same file is highlighted from slices of these tokens.
+    """
+
+    def get_lexer(self, src: str, language: str, inline: bool, stripnl: bool) -> tuple[Any, str]:  # noqa: FBT001
+        """Return the lexer of a language, and its name.
+
+        Parameters:
+            src: The code to highlight.
+            language: The language of the code.
+            inline: Whether the code is highlighted inline.
+            stripnl: Whether the lexer strips leading and trailing newlines.
+
+        Returns:
+            The lexer and its name.
+        """
+        lexer, name = super().get_lexer(src, language, inline, stripnl)
+        location = _source_location.get()
+        if location is None or inline or lexer.filters:
+            return lexer, name
+        return _SlicedLexer(lexer, location), name
+
+
+@pass_context
+def do_highlight_source(context: Context, obj: Object | Alias, **kwargs: Any) -> Markup:
+    """Highlight the source code of an object.
+
+    Parameters:
+        context: Jinja context, passed automatically.
+        obj: The object to highlight the source code of.
+        **kwargs: Arguments passed on to the `highlight` filter.
+
+    Returns:
+        The highlighted source code.
+    """
+    highlight = context.environment.filters["highlight"]
+    try:
+        filepath = obj.filepath
+        lines = obj.lines_collection[filepath]
+    except (KeyError, ValueError, FilePathError):
+        lines = None
+    if lines is None or obj.is_namespace or not obj.lineno or not obj.endlineno:
+        return highlight(obj.source, **kwargs)
+    token = _source_location.set((filepath, lines, obj.lineno, obj.endlineno))
+    try:
+        return highlight(obj.source, **kwargs)
+    finally:
+        _source_location.reset(token)
+
+
+_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+_native_templates: weakref.WeakKeyDictionary[Environment, dict[str, bool]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _is_native(env: Environment, *template_names: str) -> bool:
+    """Tell whether templates can be rendered natively, as they are not overridden.
+
+    Parameters:
+        env: The Jinja environment.
+        *template_names: The names of the templates.
+
+    Returns:
+        Whether all the templates are the ones shipped with the handler.
+    """
+    shipped = _native_templates.setdefault(env, {})
+    for name in template_names:
+        if name not in shipped:
+            filename = env.get_template(name).filename
+            shipped[name] = filename is not None and Path(filename).resolve().is_relative_to(
+                _TEMPLATES_DIR.resolve()
+            )
+        if not shipped[name]:
+            return False
+    return True
+
+
+def _render_expression(
+    env: Environment, expression: str | Expr, config: MatlabOptions, *, signature: bool
+) -> str:
+    """Render an expression like `expression.html.jinja`.
+
+    Parameters:
+        env: The Jinja environment.
+        expression: The expression to render.
+        config: The configuration options.
+        signature: Whether the expression is rendered in a signature.
+
+    Returns:
+        The same HTML as the template.
+    """
+    name = str(expression)
+    if isinstance(expression, str):
+        return expression if signature else Markup.escape(expression)
+    if doc := expression.doc:
+        if not config.signature_crossrefs:
+            return Markup.escape(name)
+        crossref = f'<a class="autorefs autorefs-external" href="{Markup.escape(doc)}">{Markup.escape(name)}</a>'
+        return env.filters["stash_crossref"](crossref, length=len(name))
+    if canonical_path := env.filters["canonical_path"](name):
+        if not config.signature_crossrefs:
+            return Markup.escape(name)
+        crossref = f'<autoref identifier="{Markup.escape(canonical_path)}" optional hover>{Markup.escape(name)}</autoref>'
+        if signature:
+            return env.filters["stash_crossref"](crossref, length=len(name))
+        return crossref
+    return "".join(
+        _render_expression(env, element, config, signature=signature) for element in expression
+    )
+
+
+def _render_signature(
+    env: Environment, function: Function, config: MatlabOptions, *, annotations: bool
+) -> str:
+    """Render a signature like `signature.html.jinja`.
+
+    Parameters:
+        env: The Jinja environment.
+        function: The function to render the signature of.
+        config: The configuration options.
+        annotations: Whether to show type annotations.
+
+    Returns:
+        The same HTML as the template.
+    """
+    if not config.show_signature:
+        return ""
+    crossrefs = config.separate_signature and config.signature_crossrefs
+    constructor = (
+        config.merge_constructor_into_class
+        and function.parent
+        and function.parent.is_class
+        and function.name == function.parent.name
+    )
+    arguments = list(function.arguments)
+    parts = ["("]
+    for index, argument in enumerate(arguments):
+        if argument.name == "obj" and index == 0 and function.parent and function.parent.is_class:
+            continue
+
+        if annotations and argument.type is not None:
+            equal = " = "
+            if config.separate_signature:
+                type_ = ": " + _render_expression(env, argument.type, config, signature=True)
+            else:
+                type_ = f": {argument.type}"
+        else:
+            equal = "="
+            type_ = ""
+
+        if config.separate_signature and config.argument_headings and config.signature_crossrefs:
+            func_path = function.path
+            if constructor:
+                func_path = func_path[: -(len(function.parent) + 1)]  # ty: ignore[invalid-argument-type]
+            name = Markup.escape(argument.name)
+            parts.append(
+                env.filters["stash_crossref"](
+                    f'<autoref identifier="{Markup.escape(func_path)}({name})" optional>{name}</autoref>',
+                    length=len(argument.name),
+                )
+            )
+        else:
+            parts.append(Markup.escape(argument.name))
+        parts.append(type_)
+
+        if argument.default is not None and getattr(argument.kind, "value", None) != "varargin":
+            parts.append(equal)
+            if crossrefs:
+                parts.append(_render_expression(env, argument.default, config, signature=True))
+            else:
+                parts.append(str(argument.default))
+
+        if index < len(arguments) - 1:
+            parts.append(", ")
+    parts.append(")")
+
+    # Functions have no `type` attribute, which the template treats as undefined.
+    returns = getattr(function, "type", None)
+    if annotations and returns and not constructor:
+        parts.append(" -> ")
+        if crossrefs:
+            parts.append(_render_expression(env, returns, config, signature=True))
+        else:
+            parts.append(str(returns))
+    return "".join(parts)
+
+
+def _render_overlay(template: Template, context: Context, **variables: Any) -> str:
+    """Render a template in the parent context of a filter, with some variables set.
+
+    Unlike `Template.render`, the parent context is not copied: the variables are
+    looked up in a small overlay first, then in the parent context.
+
+    Parameters:
+        template: The template to render.
+        context: The Jinja context of the filter.
+        **variables: The variables to set.
+
+    Returns:
+        The rendered template.
+    """
+    overlay = ChainMap(variables, context.parent)
+    template_context = template.new_context(overlay, shared=True)  # ty: ignore[invalid-argument-type]
+    try:
+        return context.environment.concat(template.root_render_func(template_context))
+    except Exception:  # noqa: BLE001
+        return context.environment.handle_exception()
+
+
 @pass_context
 def do_format_signature(
     context: Context,
@@ -143,31 +487,33 @@ def do_format_signature(
         The same code, formatted.
     """
     env = context.environment
-    template = env.get_template("signature.html.jinja")
-
-    if annotations is None:
-        new_context = context.parent
-    else:
-        new_context = dict(context.parent)
-        new_context["config"] = replace(new_context["config"], show_signature_types=annotations)
-
-    signature = template.render(new_context, function=function, signature=True)
-    signature = str(
-        env.filters["highlight"](
-            Markup.escape(signature),
-            language="matlab",
-            inline=False,
-            classes=["doc-signature"],
-            linenums=False,
-        ),
-    )
-
-    if stash := env.filters["stash_crossref"].stash:
-        for key, value in stash.items():
-            signature = re.sub(rf"\b{key}\b", value, signature)
-        stash.clear()
-
-    return signature
+    native = _is_native(env, "signature.html.jinja", "expression.html.jinja")
+
+    stash_crossref = env.filters["stash_crossref"]
+    with stash_crossref.scope():
+        if native:
+            config = context.parent["config"]
+            if annotations is None:
+                annotations = config.show_signature_types
+            signature = _render_signature(env, function, config, annotations=annotations)
+        else:
+            config = context.parent["config"]
+            if annotations is not None:
+                config = config.with_signature_types(annotations)
+            template = env.get_template("signature.html.jinja")
+            signature = _render_overlay(
+                template, context, config=config, function=function, signature=True
+            )
+        signature = str(
+            env.filters["highlight"](
+                Markup.escape(signature),
+                language="matlab",
+                inline=False,
+                classes=["doc-signature"],
+                linenums=False,
+            ),
+        )
+        return stash_crossref.unstash(signature)
 
 
 @pass_context
@@ -190,14 +536,10 @@ def do_format_arguments(
         case _:
             raise ValueError(f"Unknown section kind: {section_kind}")
 
-    html = template.render(context.parent, section=section)
-
-    if stash := env.filters["stash_crossref"].stash:
-        for key, value in stash.items():
-            html = re.sub(rf"\b{key}\b", value, html)
-        stash.clear()
-
-    return html
+    stash_crossref = env.filters["stash_crossref"]
+    with stash_crossref.scope():
+        html = _render_overlay(template, context, section=section)
+        return stash_crossref.unstash(html)
 
 
 @pass_context
@@ -222,43 +564,135 @@ def do_format_property(
         The same code, formatted.
     """
     env = context.environment
-    template = env.get_template("expression.html.jinja")
-    annotations = context.parent["config"].show_signature_types
-
-    signature = str(property_path).strip()
-    if annotations and property.type:
-        annotation = template.render(
-            context.parent,
-            expression=property.type,
-            signature=True,
-            backlink_type="returned-by",
-        )
-        signature += f": {annotation}"
-    if property.default:
-        value = template.render(
-            context.parent,
-            expression=property.default,
-            signature=True,
-            backlink_type="used-by",
+    config = context.parent["config"]
+    if _is_native(env, "expression.html.jinja"):
+
+        def render(expression: str | Expr, backlink_type: str) -> str:  # noqa: ARG001
+            return _render_expression(env, expression, config, signature=True)
+
+    else:
+        template = env.get_template("expression.html.jinja")
+
+        def render(expression: str | Expr, backlink_type: str) -> str:
+            return _render_overlay(
+                template,
+                context,
+                expression=expression,
+                signature=True,
+                backlink_type=backlink_type,
+            )
+
+    stash_crossref = env.filters["stash_crossref"]
+    with stash_crossref.scope():
+        signature = str(property_path).strip()
+        if config.show_signature_types and property.type:
+            signature += f": {render(property.type, 'returned-by')}"
+        if property.default:
+            signature += f" = {render(property.default, 'used-by')}"
+
+        signature = str(
+            env.filters["highlight"](
+                Markup.escape(signature),
+                language="matlab",
+                inline=False,
+                classes=["doc-signature"],
+                linenums=False,
+            ),
         )
-        signature += f" = {value}"
-
-    signature = str(
-        env.filters["highlight"](
-            Markup.escape(signature),
-            language="matlab",
-            inline=False,
-            classes=["doc-signature"],
-            linenums=False,
-        ),
-    )
 
-    if stash := env.filters["stash_crossref"].stash:
-        for key, value in stash.items():
-            signature = re.sub(rf"\b{key}\b", value, signature)
-        stash.clear()
+        return stash_crossref.unstash(signature)
 
-    return signature
+
+class MemberOrderCache:
+    """Least recently used cache of ordered members.
+
+    Entries are keyed by the paths, names and kinds of the members to order, the ordering methods
+    and the explicit members list, and hold the order as positions in the members list.
+    Members lists built again on each render, like the aliases of inherited members, thus
+    reuse the order computed for the same members. As the source of members can change
+    between builds, the cache is cleared by the handler on each build.
+    """
+
+    def __init__(self, maxsize: int = 1024) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            maxsize: The maximum number of entries, the least recently used are evicted first.
+        """
+        self.maxsize = maxsize
+        """The maximum number of entries."""
+        self.hits = 0
+        """The number of orderings reused from the cache."""
+        self.misses = 0
+        """The number of orderings computed."""
+        self._entries: OrderedDict[tuple, tuple[int, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def order(
+        self,
+        members: Sequence[Object | Alias],
+        order: Order | list[Order],
+        members_list: bool | list[str] | None,
+    ) -> list[Object | Alias]:
+        """Order members, reusing the order computed for the same members.
+
+        Parameters:
+            members: The members to order.
+            order: The ordering method.
+            members_list: An optional member list (manual ordering).
+
+        Returns:
+            A new list of the ordered members.
+        """
+        members = tuple(members)
+        if isinstance(order, str):
+            order = [order]
+        names = tuple(members_list) if isinstance(members_list, list) else members_list
+        key = (
+            tuple((member.path, member.name, member.kind) for member in members),
+            tuple(order),
+            names,
+        )
+        with self._lock:
+            positions = self._entries.get(key)
+            if positions is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return [members[position] for position in positions]
+
+        ordered = _order_members(members, order, members_list)
+        position_of = {id(member): position for position, member in enumerate(members)}
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = tuple(position_of[id(member)] for member in ordered)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return ordered
+
+    def clear(self) -> None:
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+
+member_order_cache = MemberOrderCache()
+"""The cache of ordered members used by [`do_order_members`][mkdocstrings_handlers.matlab.rendering.do_order_members]."""
+
+
+def _order_members(
+    members: Sequence[Object | Alias],
+    order: list[Order],
+    members_list: bool | list[str] | None,
+) -> list[Object | Alias]:
+    if isinstance(members_list, list) and members_list:
+        members_dict = {member.name: member for member in members}
+        return [members_dict[name] for name in members_list if name in members_dict]
+    for method in order:
+        with suppress(ValueError):
+            return sorted(members, key=_order_map[method])
+    return list(members)
 
 
 def do_order_members(
@@ -268,6 +702,8 @@ def do_order_members(
 ) -> Sequence[Object | Alias]:
     """Order members given an ordering method.
 
+    Orders are cached in [`member_order_cache`][mkdocstrings_handlers.matlab.rendering.member_order_cache].
+
     Parameters:
         members: The members to order.
         order: The ordering method.
@@ -276,19 +712,7 @@ def do_order_members(
     Returns:
         The same members, ordered.
     """
-    if isinstance(members_list, list) and members_list:
-        sorted_members = []
-        members_dict = {member.name: member for member in members}
-        for name in members_list:
-            if name in members_dict:
-                sorted_members.append(members_dict[name])
-        return sorted_members
-    if isinstance(order, str):
-        order = [order]
-    for method in order:
-        with suppress(ValueError):
-            return sorted(members, key=_order_map[method])
-    return members
+    return member_order_cache.order(members, order, members_list)
 
 
 def _keep_object(name: str, filters: Sequence[tuple[Pattern, bool]]) -> bool:
@@ -346,13 +770,253 @@ def _remove_cycles(objects: list[MEMBERS]) -> Iterator[MEMBERS]:
     Returns:
         An iterator yielding objects that don't create inheritance cycles.
     """
-    suppress_errors = suppress(AliasResolutionError, CyclicAliasError)
     for obj in objects:
-        if obj.is_alias:
-            with suppress_errors:
-                if obj.parent and obj.path in _parents(cast(Alias, obj)):
-                    continue
-        yield obj
+        if not _is_cyclic(obj):
+            yield obj
+
+
+def _is_cyclic(obj: MEMBERS) -> bool:
+    """
+    Tell whether an object is an alias to one of its own parents.
+
+    Args:
+        obj: The object to check.
+
+    Returns:
+        True if rendering the object would recurse infinitely, False otherwise.
+    """
+    if obj.is_alias:
+        with suppress(AliasResolutionError, CyclicAliasError):
+            return bool(obj.parent and obj.path in _parents(cast(Alias, obj)))
+    return False
+
+
+def _compile_name_filter(filters: Sequence[tuple[Pattern, bool]]) -> Callable[[str], bool]:
+    """
+    Compile filter patterns into a single function telling whether to keep a name.
+
+    When all filters either include or exclude names, their patterns are combined
+    into a single regular expression. Otherwise, the last matching filter decides,
+    so that patterns are searched one by one.
+
+    Args:
+        filters: A sequence of tuple pairs of (pattern, exclude_flag).
+
+    Returns:
+        A function returning True if an object with the given name should be kept.
+    """
+    excludes = {exclude for _, exclude in filters}
+    flags = {regex.flags for regex, _ in filters}
+    # Combining patterns would renumber their groups, breaking backreferences.
+    if len(excludes) == 1 and len(flags) == 1 and not any(regex.groups for regex, _ in filters):
+        with suppress(re.error):
+            combined = re.compile(
+                "|".join(f"(?:{regex.pattern})" for regex, _ in filters), flags.pop()
+            )
+            if excludes.pop():
+                return lambda name: combined.search(name) is None
+            return lambda name: combined.search(name) is not None
+    return lambda name: _keep_object(name, filters)
+
+
+class MemberPartition(NamedTuple):
+    """Members of an object, by kind."""
+
+    properties: list[MEMBERS]
+    """The property members."""
+    classes: list[MEMBERS]
+    """The class members."""
+    functions: list[MEMBERS]
+    """The function members."""
+    scripts: list[MEMBERS]
+    """The script members."""
+    namespaces: list[MEMBERS]
+    """The namespace members."""
+    folders: list[MEMBERS]
+    """The folder members."""
+
+
+_PARTITION_KINDS = {
+    Kind.PROPERTY: 0,
+    Kind.CLASS: 1,
+    Kind.FUNCTION: 2,
+    Kind.SCRIPT: 3,
+    Kind.NAMESPACE: 4,
+    Kind.FOLDER: 5,
+}
+
+
+class MemberFilter:
+    """Members filter compiled from rendering options.
+
+    Name filters are combined and their results memoized by name, and the selections of
+    members are turned into sets, so that each member is filtered in a single pass.
+    Filters are built by [`get_member_filter`][mkdocstrings_handlers.matlab.rendering.get_member_filter],
+    which shares them between all calls with the same options.
+    """
+
+    def __init__(
+        self,
+        *,
+        filters: Sequence[tuple[Pattern, bool]] = (),
+        members_list: bool | Sequence[str] | None = None,
+        inherited_members: bool | Sequence[str] = False,
+        private_members: bool | Sequence[str] = False,
+        hidden_members: bool | Sequence[str] = False,
+        keep_no_docstrings: bool = True,
+    ) -> None:
+        """Initialize the filter.
+
+        Parameters:
+            filters: Filters to apply, based on members' names.
+            members_list: An optional, explicit list of members to keep.
+            inherited_members: Whether to keep inherited members, or which ones.
+            private_members: Whether to keep private members, or which ones.
+            hidden_members: Whether to keep hidden members, or which ones.
+            keep_no_docstrings: Whether to keep objects with no/empty docstrings.
+        """
+        self._inherited = _as_selection(inherited_members)
+        self._inherited_specified = not isinstance(inherited_members, bool)
+        self._private = _as_selection(private_members)
+        self._hidden = _as_selection(hidden_members)
+        if members_list is None or isinstance(members_list, bool):
+            self._members: bool | frozenset[str] | None = members_list
+        else:
+            # An empty list selects no member, like false.
+            self._members = frozenset(members_list) or False
+        self._keep_name = _compile_name_filter(filters) if filters else None
+        self._keep_no_docstrings = keep_no_docstrings
+        self._kept_names: dict[str, bool] = {}
+
+    def keep(self, obj: MEMBERS) -> bool:
+        """Tell whether to keep an object.
+
+        Parameters:
+            obj: The object.
+
+        Returns:
+            True if the object should be rendered, False otherwise.
+        """
+        if self._inherited is not True and obj.inherited:
+            if self._inherited is False or obj.name not in self._inherited:
+                return False
+        if self._private is not True and obj.is_private:
+            if self._private is False or obj.name not in self._private:
+                return False
+        if self._hidden is not True and obj.is_hidden:
+            if self._hidden is False or obj.name not in self._hidden:
+                return False
+
+        if self._members is True:
+            # Keep all pre-selected members.
+            return True
+        if self._members is False:
+            # Keep selected inherited members, if any.
+            return obj.inherited
+        if self._members is not None:
+            # Keep selected members (and any pre-selected inherited members).
+            return obj.name in self._members or (self._inherited_specified and obj.inherited)
+
+        # Use filters and docstrings.
+        if self._keep_name is not None:
+            kept = self._kept_names.get(obj.name)
+            if kept is None:
+                kept = self._kept_names[obj.name] = self._keep_name(obj.name)
+            if not kept and not (self._inherited_specified and obj.inherited):
+                return False
+        if not self._keep_no_docstrings and not obj.has_docstring:
+            if not (self._inherited_specified and obj.inherited):
+                return False
+        # Prevent infinite recursion.
+        return not _is_cyclic(obj)
+
+    def __call__(self, objects: Iterable[MEMBERS]) -> list[MEMBERS]:
+        """Filter objects.
+
+        Parameters:
+            objects: The objects.
+
+        Returns:
+            The objects to render, in the same order.
+        """
+        return [obj for obj in objects if self.keep(obj)]
+
+    def partition(self, objects: Iterable[MEMBERS]) -> MemberPartition:
+        """Filter objects and group them by kind.
+
+        Parameters:
+            objects: The objects.
+
+        Returns:
+            The objects to render, by kind and in the same order.
+        """
+        partition = MemberPartition([], [], [], [], [], [])
+        for obj in objects:
+            index = _PARTITION_KINDS.get(obj.kind)
+            if index is not None and self.keep(obj):
+                partition[index].append(obj)
+        return partition
+
+
+def _as_selection(value: bool | Sequence[str]) -> bool | frozenset[str]:
+    return value if isinstance(value, bool) else frozenset(value)
+
+
+def _hashable(value: Any) -> Any:
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+@lru_cache(maxsize=256)
+def _get_member_filter(
+    filters: tuple[tuple[Pattern, bool], ...],
+    members_list: bool | tuple[str, ...] | None,
+    inherited_members: bool | tuple[str, ...],
+    private_members: bool | tuple[str, ...],
+    hidden_members: bool | tuple[str, ...],
+    keep_no_docstrings: bool,
+) -> MemberFilter:
+    return MemberFilter(
+        filters=filters,
+        members_list=members_list,
+        inherited_members=inherited_members,
+        private_members=private_members,
+        hidden_members=hidden_members,
+        keep_no_docstrings=keep_no_docstrings,
+    )
+
+
+def get_member_filter(
+    *,
+    filters: Sequence[tuple[Pattern, bool]] | None = None,
+    members_list: bool | list[str] | None = None,
+    inherited_members: bool | list[str] = False,
+    private_members: bool | list[str] = False,
+    hidden_members: bool | list[str] = False,
+    keep_no_docstrings: bool = True,
+) -> MemberFilter:
+    """Return the members filter of the given options, compiling it on first use.
+
+    Parameters:
+        filters: Filters to apply, based on members' names.
+        members_list: An optional, explicit list of members to keep.
+        inherited_members: Whether to keep inherited members, or which ones.
+        private_members: Whether to keep private members, or which ones.
+        hidden_members: Whether to keep hidden members, or which ones.
+        keep_no_docstrings: Whether to keep objects with no/empty docstrings.
+
+    Returns:
+        The members filter.
+    """
+    return _get_member_filter(
+        tuple(filters or ()),
+        _hashable(members_list),
+        _hashable(inherited_members),
+        _hashable(private_members),
+        _hashable(hidden_members),
+        keep_no_docstrings,
+    )
 
 
 def do_filter_objects(
@@ -383,75 +1047,48 @@ def do_filter_objects(
     Returns:
         A list of objects.
     """
-    inherited_members_specified = False
-    if inherited_members is True:
-        # Include all inherited members.
-        objects = list(objects_dictionary.values())
-    elif inherited_members is False:
-        # Include no inherited members.
-        objects = [obj for obj in objects_dictionary.values() if not obj.inherited]
-    else:
-        # Include specific inherited members.
-        inherited_members_specified = True
-        objects = [
-            obj
-            for obj in objects_dictionary.values()
-            if not obj.inherited or obj.name in set(inherited_members)
-        ]
-
-    if isinstance(private_members, bool) and not private_members:
-        objects = [obj for obj in objects if not obj.is_private]
-    elif isinstance(private_members, list):
-        objects = [
-            obj
-            for obj in objects
-            if not obj.is_private or (obj.is_private and obj.name in private_members)
-        ]
-
-    if isinstance(hidden_members, bool) and not hidden_members:
-        objects = [obj for obj in objects if not obj.is_hidden]
-    elif isinstance(hidden_members, list):
-        objects = [
-            obj
-            for obj in objects
-            if not obj.is_hidden or (obj.is_hidden and obj.name in hidden_members)
-        ]
-
-    if members_list is True:
-        # Return all pre-selected members.
-        return objects
-
-    if members_list is False or members_list == []:
-        # Return selected inherited members, if any.
-        return [obj for obj in objects if obj.inherited]
-
-    if members_list is not None:
-        # Return selected members (keeping any pre-selected inherited members).
-        return [
-            obj
-            for obj in objects
-            if obj.name in set(members_list) or (inherited_members_specified and obj.inherited)
-        ]
-
-    # Use filters and docstrings.
-    if filters:
-        objects = [
-            obj
-            for obj in objects
-            if _keep_object(obj.name, filters) or (inherited_members_specified and obj.inherited)
-        ]
-    if not keep_no_docstrings:
-        objects = [
-            obj
-            for obj in objects
-            if obj.has_docstring or (inherited_members_specified and obj.inherited)
-        ]
-
-    # Prevent infinite recursion.
-    if objects:
-        objects = list(_remove_cycles(objects))
-
-    return objects
+    return get_member_filter(
+        filters=filters,
+        members_list=members_list,
+        inherited_members=inherited_members,
+        private_members=private_members,
+        hidden_members=hidden_members,
+        keep_no_docstrings=keep_no_docstrings,
+    )(objects_dictionary.values())
+
+
+def do_partition_members(
+    objects_dictionary: dict[str, MEMBERS],
+    *,
+    filters: Sequence[tuple[Pattern, bool]] | None = None,
+    members_list: bool | list[str] | None = None,
+    inherited_members: bool | list[str] = False,
+    private_members: bool | list[str] = False,
+    hidden_members: bool | list[str] = False,
+    keep_no_docstrings: bool = True,
+) -> MemberPartition:
+    """Filter a dictionary of objects and group them by kind, in a single pass.
+
+    Parameters:
+        objects_dictionary: The dictionary of objects, e.g. all the members of an object.
+        filters: Filters to apply, based on members' names.
+        members_list: An optional, explicit list of members to keep.
+        inherited_members: Whether to keep inherited members or exclude them.
+        private_members: Whether to keep private members or exclude them.
+        hidden_members: Whether to keep hidden members or exclude them.
+        keep_no_docstrings: Whether to keep objects with no/empty docstrings (recursive check).
+
+    Returns:
+        The objects, by kind. See [`do_filter_objects`][mkdocstrings_handlers.matlab.rendering.do_filter_objects].
+    """
+    return get_member_filter(
+        filters=filters,
+        members_list=members_list,
+        inherited_members=inherited_members,
+        private_members=private_members,
+        hidden_members=hidden_members,
+        keep_no_docstrings=keep_no_docstrings,
+    ).partition(objects_dictionary.values())
 
 
 def do_get_template(obj: Object) -> str:
@@ -609,15 +1246,106 @@ def do_as_namespaces_section(
     )
 
 
+def _freeze(value: Any) -> Any:
+    """Convert parser options to a hashable value.
+
+    Parameters:
+        value: The parser options, or one of their values.
+
+    Returns:
+        A hashable equivalent of the value.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+class DocstringSectionsCache:
+    """Least recently used cache of parsed docstring sections.
+
+    Entries are keyed by the docstring text, the docstring style, the parser options and
+    the path of the object the docstring belongs to. Parsers also read the arguments and
+    annotations of that object, so entries are only reused for docstrings of the same
+    object, which entries reference weakly so as not to keep the models of previous
+    builds alive.
+
+    The sections are shared by every caller that parses the same docstring, and must not
+    be modified: templates and filters only read them, and only the list holding them
+    is a new one on each call.
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        """Initialize the cache.
+
+        Parameters:
+            maxsize: The maximum number of entries, the least recently used are evicted first.
+        """
+        self.maxsize = maxsize
+        """The maximum number of entries."""
+        self._entries: OrderedDict[tuple, tuple[weakref.ref | None, list[DocstringSection]]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def parse(
+        self,
+        docstring: Docstring,
+        style: DocstringStyle | Parser | None,
+        options: Any,
+    ) -> list[DocstringSection]:
+        """Parse a docstring, reusing the sections of a previous parse.
+
+        Parameters:
+            docstring: The docstring to parse.
+            style: The docstring style.
+            options: The parser options, as a mapping or dataclass.
+
+        Returns:
+            A new list of the parsed sections, which are shared and must not be modified.
+        """
+        if isinstance(style, Parser):
+            style = style.value  # ty: ignore[invalid-assignment]
+        options = asdict(options) if is_dataclass(options) else dict(options or {})  # ty: ignore[invalid-argument-type]
+        parent = docstring.parent
+        key = (docstring.value, style, getattr(parent, "path", None), _freeze(options))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] and entry[0]()) is parent:
+                self._entries.move_to_end(key)
+                return list(entry[1])
+
+        sections = parse(docstring, style, **options)
+        with self._lock:
+            self._entries[key] = (None if parent is None else weakref.ref(parent), sections)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return list(sections)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+
+docstring_sections_cache = DocstringSectionsCache()
+"""The cache of docstring sections used by the `parse_docstring` filter."""
+
+
 def do_parse_docstring(
     docstring: Docstring | None,
-    docstring_style: DocstringStyle,
-    docstring_options: dict[str, Any] | None,
+    docstring_style: DocstringStyle | Parser | None,
+    docstring_options: Any,
 ) -> list[DocstringSection]:
     if docstring is None:
         return []
-    options = docstring_options or {}
-    return parse(docstring, docstring_style, **options)
+    return docstring_sections_cache.parse(docstring, docstring_style, docstring_options)
 
 
 def do_function_docstring(
@@ -716,11 +1444,17 @@ def do_function_docstring(
     return docstring_sections
 
 
-def do_as_inheritance_diagram_section(model: Class) -> DocstringSectionText | None:
+def do_as_inheritance_diagram_section(
+    model: Class,
+    max_depth: int | None = None,
+    max_breadth: int | None = None,
+) -> DocstringSectionText | None:
     """Generate an inheritance diagram section for a class.
 
     Args:
         model: The class model to create an inheritance diagram for.
+        max_depth: The maximum number of generations of ancestors to show.
+        max_breadth: The maximum number of base classes to show for each class.
 
     Returns:
         A docstring section with a Mermaid diagram, or None if there's no inheritance.
@@ -729,39 +1463,12 @@ def do_as_inheritance_diagram_section(model: Class) -> DocstringSectionText | No
     if not hasattr(model, "bases") or not model.bases:
         return None
 
-    def get_id(str: str) -> str:
-        return str.replace(".", "_")
-
-    def get_nodes(model: Class, nodes: set[str] = set()) -> set[str]:
-        nodes.add(f"   {get_id(model.name)}[{model.name}]")
-        for base in [str(base) for base in model.bases]:
-            super = model.paths_collection.get_member(base) if model.paths_collection else None
-            if super is None:
-                nodes.add(f"   {get_id(base)}[{base}]")
-            else:
-                if isinstance(super, Class):
-                    get_nodes(super, nodes)
-        return nodes
-
-    def get_links(model: Class, links: set[str] = set()) -> set[str]:
-        for base in [str(base) for base in model.bases]:
-            super = model.paths_collection.get_member(base) if model.paths_collection else None
-            if super is None:
-                links.add(f"   {get_id(base)} --> {get_id(model.name)}")
-            else:
-                if isinstance(super, Class):
-                    links.add(f"   {get_id(super.name)} --> {get_id(model.name)}")
-                    get_links(super, links)
-        return links
-
-    nodes = get_nodes(model)
-    if len(nodes) == 1:
+    paths_collection = model.paths_collection
+    hierarchy = getattr(paths_collection, "hierarchy", None) or HierarchyIndex(paths_collection)
+    section = hierarchy.diagram(model, max_depth=max_depth, max_breadth=max_breadth)
+    if section is None:
         return None
 
-    nodes_str = "\n".join(list(nodes))
-    links_str = "\n".join(list(get_links(model)))
-    section = f"```mermaid\nflowchart TB\n{nodes_str}\n{links_str}\n```"
-
     return DocstringSectionText(section, title="Inheritance Diagram")
 
 
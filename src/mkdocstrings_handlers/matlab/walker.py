@@ -0,0 +1,492 @@
+"""Discovery of the MATLAB files and folders on the MATLAB path, in a single pass over each folder."""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from maxx.collection import (
+    CONTENTS_FILE,
+    FOLDER_PREFIXES,
+    MFILE_SUFFIX,
+    MLX_SUFFIX,
+    PRIVATE_FOLDER,
+)
+from mkdocstrings import get_logger
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+__all__ = ["PathWalker"]
+
+_logger = get_logger(__name__)
+
+_GITIGNORE = ".gitignore"
+# Folders modified less than this many nanoseconds before they are listed may change again
+# without their modification time changing, as file systems store times with a coarse
+# resolution: they are always listed again.
+_RACY_NS = 2_000_000_000
+
+
+class _Entry(NamedTuple):
+    """A file or folder listed in a folder."""
+
+    name: str
+    path: Path
+    is_dir: bool
+    is_file: bool
+    is_symlink: bool
+
+
+class _Rule(NamedTuple):
+    """An exclude pattern, or a pattern of a `.gitignore` file."""
+
+    base: str
+    """The folder the pattern is relative to, as a POSIX path."""
+    pattern: re.Pattern
+    """The pattern, matching paths relative to `base` and starting with a slash."""
+    negate: bool
+    """Whether the pattern includes the paths that previous patterns excluded."""
+    dir_only: bool
+    """Whether the pattern only matches folders."""
+
+
+def _translate_segment(segment: str) -> str:
+    """Translate a glob pattern matching a single path segment to a regular expression."""
+    regex = []
+    index = 0
+    while index < len(segment):
+        char = segment[index]
+        index += 1
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[" and (end := segment.find("]", index + 1)) != -1:
+            chars = segment[index:end].replace("\\", "\\\\")
+            regex.append("[^" + chars[1:] + "]" if chars[:1] == "!" else "[" + chars + "]")
+            index = end + 1
+        else:
+            regex.append(re.escape(char))
+    return "".join(regex)
+
+
+def _translate(pattern: str) -> re.Pattern:
+    """Translate a glob pattern to a regular expression.
+
+    Parameters:
+        pattern: The pattern, where `**` matches any number of folders, including none.
+
+    Returns:
+        The regular expression, matching POSIX paths that start with a slash.
+    """
+    regex = []
+    for segment in pattern.strip("/").split("/"):
+        if segment == "**":
+            regex.append("(?:/[^/]+)*")
+        elif segment not in ("", "."):
+            regex.append("/" + _translate_segment(segment))
+    return re.compile("".join(regex))
+
+
+def _parse_rule(base: str, line: str, *, gitignore: bool) -> _Rule | None:
+    """Parse an exclude pattern, or a line of a `.gitignore` file.
+
+    Patterns without slashes (other than a trailing one) match files and folders at any depth,
+    other patterns are relative to `base`. A trailing slash only matches folders.
+    In `.gitignore` files, lines starting with `!` include paths again.
+
+    Parameters:
+        base: The folder the pattern is relative to, as a POSIX path.
+        line: The pattern.
+        gitignore: Whether the pattern is a line of a `.gitignore` file.
+
+    Returns:
+        The rule, or `None` for blank lines and comments.
+    """
+    line = line.rstrip("\n\r")
+    if gitignore:
+        if not line.strip() or line.startswith("#"):
+            return None
+        line = line.rstrip(" ")
+    negate = gitignore and line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    if "/" not in line:
+        # Rules only apply to the paths below their folder, whose names are matched anywhere.
+        return _Rule("", _translate("**/" + line), negate, dir_only)
+    return _Rule(base, _translate(line), negate, dir_only)
+
+
+def _stem(name: str) -> str:
+    return os.path.splitext(name)[0]  # noqa: PTH122
+
+
+class PathWalker:
+    """Walker listing the MATLAB files and folders of the MATLAB path.
+
+    Each folder is listed once with [`os.scandir`][], whatever the number of glob patterns
+    and of paths it is walked for, until it changes, see
+    [`revalidate`][mkdocstrings_handlers.matlab.walker.PathWalker.revalidate], or until
+    [`clear`][mkdocstrings_handlers.matlab.walker.PathWalker.clear] is called. Folders and
+    files can be excluded with glob patterns, or with the `.gitignore` files of the folders
+    walked and of their parents, up to the root of their Git repository. Symbolic links to
+    folders are followed, except when they point to a folder being walked.
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        *,
+        exclude: Sequence[str] = (),
+        gitignore: bool = False,
+        max_depth: int | None = None,
+    ) -> None:
+        """Initialize the walker.
+
+        Parameters:
+            base_dir: The folder that glob patterns and exclude patterns are relative to.
+            exclude: Glob patterns of the files and folders to leave out.
+            gitignore: Whether to leave out the files and folders ignored by Git.
+            max_depth: The maximum depth of the subfolders added by recursive walks,
+                see [`members`][mkdocstrings_handlers.matlab.walker.PathWalker.members].
+        """
+        self.base_dir = base_dir
+        """The folder that glob patterns and exclude patterns are relative to."""
+        self.exclude = tuple(exclude)
+        """The glob patterns of the files and folders to leave out."""
+        self.gitignore = gitignore
+        """Whether the files and folders ignored by Git are left out."""
+        self.max_depth = max_depth
+        """The maximum depth of the subfolders added by recursive walks."""
+        self._base = Path(os.path.abspath(base_dir)).as_posix().rstrip("/")  # noqa: PTH100
+        self._exclude_rules = tuple(
+            rule
+            for pattern in exclude
+            if (rule := _parse_rule(self._base, pattern, gitignore=False)) is not None
+        )
+        self._listings: dict[Path, list[_Entry]] = {}
+        self._mtimes: dict[Path, int] = {}
+        # Listed entries by path string, which hashes faster than paths.
+        self._entries: dict[str, _Entry] = {}
+        self._gitignores: dict[Path, tuple[_Rule, ...]] = {}
+
+    def clear(self) -> None:
+        """Forget the folders listed so far, so that they are listed again when walked."""
+        self._listings.clear()
+        self._mtimes.clear()
+        self._entries.clear()
+        self._gitignores.clear()
+
+    def revalidate(self) -> set[Path]:
+        """Forget the folders that changed since they were listed.
+
+        Adding, removing or renaming a file or folder changes the modification time of the
+        folder containing it, so only the folders whose modification time changed are listed
+        again when walked. Files edited in place leave their folder unchanged, so existing
+        `.gitignore` files are read again.
+
+        Returns:
+            The folders forgotten.
+        """
+        changed = set()
+        for folder in list(self._listings):
+            try:
+                mtime = folder.stat().st_mtime_ns
+            except OSError:
+                mtime = None
+            if mtime is None or mtime != self._mtimes.get(folder):
+                for entry in self._listings.pop(folder):
+                    self._entries.pop(str(entry.path), None)
+                self._mtimes.pop(folder, None)
+                changed.add(folder)
+        self._gitignores = {
+            folder: rules
+            for folder, rules in self._gitignores.items()
+            if folder in self._listings and str(folder / _GITIGNORE) not in self._entries
+        }
+        return changed
+
+    def exists(self, path: Path) -> bool:
+        """Return whether a file or folder exists, from the listing of its folder.
+
+        Parameters:
+            path: The path.
+
+        Returns:
+            Whether the path is listed in its folder.
+        """
+        key = str(path)
+        if key not in self._entries:
+            self._list(path.parent)
+        return key in self._entries
+
+    def is_dir(self, path: Path) -> bool:
+        """Return whether a path is a folder, from the listing of its folder.
+
+        Parameters:
+            path: The path.
+
+        Returns:
+            Whether the path is listed in its folder as a folder.
+        """
+        entry = self._entries.get(str(path))
+        if entry is None:
+            self._list(path.parent)
+            entry = self._entries.get(str(path))
+        return entry is not None and entry.is_dir
+
+    def _list(self, folder: Path) -> list[_Entry]:
+        entries = self._listings.get(folder)
+        if entries is None:
+            entries = []
+            try:
+                # Taken before listing, so that changes made while listing are seen as changes.
+                listed_at = time.time_ns()
+                mtime = folder.stat().st_mtime_ns
+                if listed_at - mtime > _RACY_NS:
+                    self._mtimes[folder] = mtime
+                with os.scandir(folder) as scanner:
+                    for entry in scanner:
+                        try:
+                            is_dir = entry.is_dir()
+                            is_file = not is_dir and entry.is_file()
+                            is_symlink = entry.is_symlink()
+                        except OSError:
+                            continue
+                        entries.append(
+                            _Entry(entry.name, folder / entry.name, is_dir, is_file, is_symlink)
+                        )
+            except OSError as error:
+                _logger.debug(f"Could not list {folder}: {error}")
+                self._mtimes.pop(folder, None)
+            self._listings[folder] = entries
+            self._entries.update((str(entry.path), entry) for entry in entries)
+        return entries
+
+    def _read_gitignore(self, folder: Path) -> tuple[_Rule, ...]:
+        rules = self._gitignores.get(folder)
+        if rules is None:
+            try:
+                lines = (folder / _GITIGNORE).read_text(encoding="utf-8").splitlines()
+            except (OSError, UnicodeDecodeError):
+                lines = []
+            base = folder.as_posix().rstrip("/")
+            rules = self._gitignores[folder] = tuple(
+                rule for line in lines if (rule := _parse_rule(base, line, gitignore=True))
+            )
+        return rules
+
+    def _rules(self, folder: Path) -> tuple[_Rule, ...]:
+        """Return the exclude rules applying to the start folder of a walk.
+
+        Parameters:
+            folder: The folder the walk starts from.
+
+        Returns:
+            The exclude patterns, followed by the patterns of the `.gitignore` files of the
+                folder and its parents, up to the root of its Git repository, outermost first.
+        """
+        if not self.gitignore:
+            return self._exclude_rules
+        folders = [folder]
+        for parent in folder.parents:
+            if (folders[-1] / ".git").exists():
+                break
+            folders.append(parent)
+        else:
+            # Not in a Git repository.
+            folders = [folder]
+        rules = list(self._exclude_rules)
+        for parent in reversed(folders):
+            rules.extend(self._read_gitignore(parent))
+        return tuple(rules)
+
+    def _excluded(self, entry: _Entry, rules: Iterable[_Rule]) -> bool:
+        if self.gitignore and entry.name == ".git":
+            return True
+        path = entry.path.as_posix()
+        excluded = False
+        for rule in rules:
+            if excluded is rule.negate and (entry.is_dir or not rule.dir_only):
+                if path.startswith(rule.base + "/") and rule.pattern.fullmatch(
+                    path[len(rule.base) :]
+                ):
+                    excluded = not rule.negate
+        return excluded
+
+    def _children(
+        self, folder: Path, rules: tuple[_Rule, ...], real: str
+    ) -> tuple[list[tuple[_Entry, str]], tuple[_Rule, ...]]:
+        """List the entries of a folder that are not excluded.
+
+        Parameters:
+            folder: The folder.
+            rules: The exclude rules applying to the folder.
+            real: The real path of the folder, with symbolic links resolved.
+
+        Returns:
+            The entries with their real paths, without those of symbolic links pointing to a
+                folder being walked, and the exclude rules applying to the subfolders.
+        """
+        if self.gitignore:
+            rules = (*rules, *self._read_gitignore(folder))
+        children = []
+        for entry in self._list(folder):
+            if self._excluded(entry, rules):
+                continue
+            child_real = f"{real.rstrip('/')}/{entry.name}"
+            if entry.is_dir and entry.is_symlink:
+                child_real = Path(os.path.realpath(entry.path)).as_posix()  # noqa: PTH111
+                if real == child_real or real.startswith(child_real.rstrip("/") + "/"):
+                    _logger.debug(f"Skipping {entry.path}, a symbolic link to one of its parents")
+                    continue
+            children.append((entry, child_real))
+        return children, rules
+
+    def expand(self, patterns: Sequence[str]) -> list[list[Path]]:
+        """Return the folders matching glob patterns.
+
+        All patterns are matched in a single walk, that only enters the folders
+        that can contain matches.
+
+        Parameters:
+            patterns: Glob patterns relative to the base folder, where `**` matches
+                any number of folders, including none.
+
+        Returns:
+            The matching folders of each pattern, in the order they were walked.
+        """
+        compiled = [_translate(pattern) for pattern in patterns]
+        segments = [
+            [segment for segment in pattern.strip("/").split("/") if segment not in ("", ".")]
+            for pattern in patterns
+        ]
+        prefixes = [
+            [re.compile(_translate_segment(segment)) for segment in pattern_segments]
+            for pattern_segments in segments
+        ]
+        matches: list[list[Path]] = [[] for _ in patterns]
+
+        def can_contain_matches(parts: list[str]) -> bool:
+            for pattern_segments, pattern_prefixes in zip(segments, prefixes):
+                for index, part in enumerate(parts):
+                    if index >= len(pattern_segments):
+                        break
+                    if pattern_segments[index] == "**":
+                        return True
+                    if not pattern_prefixes[index].fullmatch(part):
+                        break
+                else:
+                    if len(parts) < len(pattern_segments):
+                        return True
+            return False
+
+        def visit(folder: Path, parts: list[str], rules: tuple[_Rule, ...], real: str) -> None:
+            relative = "".join("/" + part for part in parts)
+            for index, pattern in enumerate(compiled):
+                if pattern.fullmatch(relative):
+                    matches[index].append(folder)
+            if not can_contain_matches(parts):
+                return
+            children, rules = self._children(folder, rules, real)
+            for entry, child_real in children:
+                if entry.is_dir:
+                    visit(entry.path, [*parts, entry.name], rules, child_real)
+
+        base_real = Path(os.path.realpath(self.base_dir)).as_posix()  # noqa: PTH111
+        visit(self.base_dir, [], self._rules(self.base_dir), base_real)
+        return matches
+
+    def members(
+        self, root: Path, *, recursive: bool = False, parse_live_scripts: bool = False
+    ) -> list[Path]:
+        """Return the MATLAB files and folders to add to the MATLAB path for a folder.
+
+        Lists the same paths as `maxx.collection._PathGlobber`: the MATLAB files, namespace
+        and class folders of the folder, and when recursive, its subfolders containing
+        MATLAB files, other than `private` folders, and their members. Subfolders deeper than
+        [`max_depth`][mkdocstrings_handlers.matlab.walker.PathWalker.max_depth] are left out.
+
+        Parameters:
+            root: The folder.
+            recursive: Whether to walk the subfolders of the folder.
+            parse_live_scripts: Whether to list live scripts.
+
+        Returns:
+            The paths, in the order they were walked.
+        """
+        real = Path(os.path.realpath(root)).as_posix()  # noqa: PTH111
+        paths, _ = self._walk(root, self._rules(root), real, recursive, 0, parse_live_scripts)
+        return paths
+
+    def _walk(
+        self,
+        folder: Path,
+        rules: tuple[_Rule, ...],
+        real: str,
+        recursive: bool,  # noqa: FBT001
+        depth: int,
+        parse_live_scripts: bool,  # noqa: FBT001
+    ) -> tuple[list[Path], bool]:
+        """Walk a folder.
+
+        Returns:
+            The paths to add, and whether the folder contains MATLAB files at any depth.
+        """
+        paths: list[Path] = []
+        has_mfiles = False
+        children, rules = self._children(folder, rules, real)
+        for entry, child_real in children:
+            if entry.is_dir:
+                walked = entry.name[0] in FOLDER_PREFIXES or (
+                    recursive
+                    and _stem(entry.name) != PRIVATE_FOLDER
+                    and (self.max_depth is None or depth < self.max_depth)
+                )
+                if not walked:
+                    has_mfiles = has_mfiles or self._has_mfiles(entry.path, rules, child_real)
+                    continue
+                prefixed = entry.name[0] in FOLDER_PREFIXES
+                sub_paths, sub_has_mfiles = self._walk(
+                    entry.path,
+                    rules,
+                    child_real,
+                    recursive and not prefixed,
+                    depth + 1,
+                    parse_live_scripts,
+                )
+                has_mfiles = has_mfiles or sub_has_mfiles
+                if prefixed or sub_has_mfiles:
+                    paths.append(entry.path)
+                paths.extend(sub_paths)
+            elif entry.is_file:
+                suffix = os.path.splitext(entry.name)[1]  # noqa: PTH122
+                if suffix == MFILE_SUFFIX:
+                    has_mfiles = True
+                    if entry.name != CONTENTS_FILE:
+                        paths.append(entry.path)
+                elif suffix == MLX_SUFFIX and parse_live_scripts:
+                    paths.append(entry.path)
+        return paths, has_mfiles
+
+    def _has_mfiles(self, folder: Path, rules: tuple[_Rule, ...], real: str) -> bool:
+        children, rules = self._children(folder, rules, real)
+        return any(
+            os.path.splitext(entry.name)[1] == MFILE_SUFFIX  # noqa: PTH122
+            for entry, _ in children
+            if entry.is_file
+        ) or any(
+            self._has_mfiles(entry.path, rules, child_real)
+            for entry, child_real in children
+            if entry.is_dir
+        )
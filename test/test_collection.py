@@ -0,0 +1,371 @@
+"""Tests for the `collection` module."""
+
+from __future__ import annotations
+
+import codecs
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any
+
+import charset_normalizer
+import pytest
+from maxx.collection import PathsCollection
+from maxx.config import ParserConfig
+from maxx.treesitter import FileParser
+
+from mkdocstrings_handlers.matlab import collection as collection_module
+from mkdocstrings_handlers.matlab.collection import (
+    LazyLinesCollection,
+    MatlabPathsCollection,
+    ParseCache,
+)
+
+FIXTURE = Path(__file__).parent / "fixture"
+
+
+@pytest.fixture
+def fixture_copy(tmp_path: Path) -> Path:
+    """Return a writable copy of the MATLAB test fixture."""
+    path = tmp_path / "fixture"
+    shutil.copytree(FIXTURE, path)
+    return path
+
+
+def _collect(path: Path, cache_dir: Path, parser_config: ParserConfig | None = None):
+    parser_config = parser_config or ParserConfig()
+    return MatlabPathsCollection(
+        [path],
+        recursive=True,
+        working_directory=path,
+        parser_config=parser_config,
+        parse_cache=ParseCache(cache_dir, parser_config),
+    )
+
+
+def _count_parses(monkeypatch: pytest.MonkeyPatch) -> list[Path]:
+    parsed: list[Path] = []
+    original = FileParser.parse
+
+    def parse(self, *args, **kwargs):
+        parsed.append(self.filepath)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(FileParser, "parse", parse)
+    return parsed
+
+
+def test_parse_cache_reuses_unchanged_files(
+    fixture_copy: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert a second collection only parses files that changed."""
+    cache_dir = tmp_path / "cache"
+    first = _collect(fixture_copy, cache_dir)
+
+    parsed = _count_parses(monkeypatch)
+    (fixture_copy / "module_function.m").write_text(
+        "function module_function()\n% Changed docstring.\nend\n"
+    )
+    second = _collect(fixture_copy, cache_dir)
+
+    assert parsed == [fixture_copy / "module_function.m"]
+    assert second.members.keys() == first.members.keys()
+    assert second["module_function"].docstring.value == "Changed docstring."
+    assert second["moduleClass"].source == first["moduleClass"].source
+    assert second["moduleClass"].paths_collection is second
+    assert str(second["module_arguments"].arguments[0].type) == str(
+        first["module_arguments"].arguments[0].type
+    )
+
+
+def test_parse_cache_keyed_by_parser_config(
+    fixture_copy: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert cached models are not reused with a different parser configuration."""
+    cache_dir = tmp_path / "cache"
+    _collect(fixture_copy, cache_dir)
+
+    parsed = _count_parses(monkeypatch)
+    _collect(fixture_copy, cache_dir, ParserConfig(docstring_before_properties=True))
+    assert parsed
+
+
+def test_parse_cache_ignores_corrupt_entries(fixture_copy: Path, tmp_path: Path) -> None:
+    """Assert unreadable cache entries are parsed again."""
+    cache_dir = tmp_path / "cache"
+    _collect(fixture_copy, cache_dir)
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b"corrupt")
+
+    collection = _collect(fixture_copy, cache_dir)
+    assert collection["module_function"].docstring is not None
+
+
+@pytest.mark.parametrize(
+    ("content", "hint"),
+    [
+        (b"x = 1;\n", None),
+        (codecs.BOM_UTF8 + "x = 'caf\u00e9';\n".encode(), None),
+        ("x = 'caf\u00e9';\n".encode(), None),
+        (codecs.BOM_UTF16_LE + "x = 1;\n".encode("utf-16-le"), None),
+        ("x = 'caf\u00e9'; % \u00e0 la carte\n".encode("latin-1"), "latin_1"),
+    ],
+)
+def test_detect_encoding_fast_path(
+    content: bytes, hint: str | None, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert common encodings are detected as by `charset_normalizer`, without running it."""
+    expected = charset_normalizer.from_bytes(content).best().encoding  # ty: ignore[possibly-missing-attribute]
+    if hint is not None:
+        expected = hint
+    monkeypatch.setattr(charset_normalizer, "from_bytes", pytest.fail)
+    assert collection_module._detect_encoding(content, hint) == expected
+
+
+def test_parse_cache_keeps_encoding(fixture_copy: Path, tmp_path: Path) -> None:
+    """Assert the encoding of a cached file is tried first when the file changes."""
+    path = fixture_copy / "module_function.m"
+    path.write_bytes(path.read_bytes().replace(b"%", "% \u00e9".encode("cp1252"), 1))
+    cache_dir = tmp_path / "cache"
+    _collect(fixture_copy, cache_dir)["module_function"].docstring  # noqa: B018
+    encoding = ParseCache(cache_dir, ParserConfig()).encoding(path)
+    assert encoding is not None
+    assert encoding != "utf_8"
+    assert collection_module._detect_encoding(path.read_bytes() + b"\xe9", encoding) == encoding
+
+
+def test_lazy_collection_parses_on_first_access(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Assert a lazy collection parses nothing up front and only what is resolved."""
+    parsed = _count_parses(monkeypatch)
+    lazy = MatlabPathsCollection([FIXTURE], recursive=True, working_directory=FIXTURE, lazy=True)
+    assert parsed == []
+
+    function = lazy["moduleNamespace.namespace_function"]
+    assert function.path == "moduleNamespace.namespace_function"
+    assert FIXTURE / "moduleClass.m" not in parsed
+
+
+def test_lazy_collection_matches_eager_collection() -> None:
+    """Assert a lazy collection indexes and resolves the same objects as an eager one."""
+    eager = MatlabPathsCollection([FIXTURE], recursive=True, working_directory=FIXTURE)
+    lazy = MatlabPathsCollection([FIXTURE], recursive=True, working_directory=FIXTURE, lazy=True)
+
+    assert {name: list(paths) for name, paths in lazy._mapping.items()} == {
+        name: list(paths) for name, paths in eager._mapping.items()
+    }
+    # Resolve members before their namespaces and class folders.
+    for identifier in sorted(eager._mapping, reverse=True):
+        assert lazy[identifier].path == eager[identifier].path
+        assert lazy[identifier].members.keys() == eager[identifier].members.keys()
+
+
+def test_lazy_lines_match_eager_lines(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Assert lazily read lines are the lines of the parsed files, read on access only."""
+    eager = MatlabPathsCollection([FIXTURE], recursive=True, working_directory=FIXTURE)
+    lazy = MatlabPathsCollection(
+        [FIXTURE], recursive=True, working_directory=FIXTURE, lazy_lines=True
+    )
+    lines = lazy.lines_collection
+    assert isinstance(lines, LazyLinesCollection)
+    assert lines._data == {}
+    assert lines.keys() == eager.lines_collection.keys()
+
+    read = []
+    read_bytes = Path.read_bytes
+    monkeypatch.setattr(Path, "read_bytes", lambda path: read.append(path) or read_bytes(path))
+    assert lazy["moduleClass"].source == eager["moduleClass"].source
+    assert lines[FIXTURE / "moduleClass.m"] is lines[FIXTURE / "moduleClass.m"]
+    assert read == [FIXTURE / "moduleClass.m"]
+
+    lines.maxsize = 1
+    for path in lines.keys():
+        assert lines[path] == eager.lines_collection[path]
+    assert len(lines._recent) == 1
+
+
+def test_parallel_collection_matches_serial_collection(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert parsing in worker processes collects the same objects as parsing serially."""
+    monkeypatch.setattr(collection_module, "_available_cpus", lambda: 2)
+    monkeypatch.setattr(collection_module, "_MIN_FILES_PER_WORKER", 1)
+    serial = MatlabPathsCollection([FIXTURE], recursive=True, working_directory=FIXTURE)
+    loaded = []
+    loads_model = collection_module._loads_model
+    monkeypatch.setattr(
+        collection_module,
+        "_loads_model",
+        lambda *args: loaded.append(args) or loads_model(*args),
+    )
+    parallel = MatlabPathsCollection(
+        [FIXTURE],
+        recursive=True,
+        working_directory=FIXTURE,
+        parse_workers=2,
+        parse_cache=ParseCache(tmp_path / "cache", ParserConfig()),
+    )
+
+    assert loaded
+    assert parallel.members.keys() == serial.members.keys()
+    assert parallel._prefetched == {}
+    for identifier in serial._mapping:
+        assert parallel[identifier].path == serial[identifier].path
+        assert parallel[identifier].members.keys() == serial[identifier].members.keys()
+        assert parallel[identifier].paths_collection is parallel
+    assert parallel["moduleClass"].source == serial["moduleClass"].source
+    assert str(parallel["module_arguments"].arguments[0].type) == str(
+        serial["module_arguments"].arguments[0].type
+    )
+    assert any((tmp_path / "cache").iterdir())
+
+
+@pytest.mark.parametrize(("cpus", "min_files"), [(1, 1), (2, 64)])
+def test_parallel_collection_parses_serially(
+    monkeypatch: pytest.MonkeyPatch, cpus: int, min_files: int
+) -> None:
+    """Assert files are parsed serially without spare CPUs or with too few files per worker."""
+    monkeypatch.setattr(collection_module, "_available_cpus", lambda: cpus)
+    monkeypatch.setattr(collection_module, "_MIN_FILES_PER_WORKER", min_files)
+    loaded = []
+    loads_model = collection_module._loads_model
+    monkeypatch.setattr(
+        collection_module,
+        "_loads_model",
+        lambda *args: loaded.append(args) or loads_model(*args),
+    )
+
+    collection = MatlabPathsCollection(
+        [FIXTURE], recursive=True, working_directory=FIXTURE, parse_workers=4
+    )
+    assert collection["moduleClass"].path == "moduleClass"
+    assert loaded == []
+
+
+def test_canonical_path_resolves_identifiers_once(
+    fixture_copy: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert identifiers are resolved once until the search path changes."""
+    collection = MatlabPathsCollection(
+        [fixture_copy], recursive=True, working_directory=fixture_copy
+    )
+    resolved: list[str] = []
+    get_member = collection.get_member
+
+    def counting_get_member(identifier: str, *args: Any) -> Any:
+        resolved.append(identifier)
+        return get_member(identifier, *args)
+
+    monkeypatch.setattr(collection, "get_member", counting_get_member)
+
+    for _ in range(3):
+        assert collection.canonical_path("moduleClass") == "moduleClass"
+        assert collection.canonical_path("double") is None
+    assert resolved == ["moduleClass", "double"]
+
+    (fixture_copy / "double.m").write_text("function double()\nend\n")
+    collection.refresh()
+    assert collection.canonical_path("double") == "double"
+
+
+def test_refresh_collects_changed_files_only(
+    fixture_copy: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert refreshing a collection only parses the files and folders that changed."""
+    collection = MatlabPathsCollection(
+        [fixture_copy], recursive=True, working_directory=fixture_copy
+    )
+    assert collection.refresh() == set()
+
+    parsed = _count_parses(monkeypatch)
+    method = fixture_copy / "@classFolder" / "method.m"
+    method.write_text(method.read_text().replace("Docstring for method.", "Changed method."))
+    (fixture_copy / "+moduleNamespace" / "new_function.m").write_text(
+        "function new_function()\n% New function.\nend\n"
+    )
+    (fixture_copy / "module_function.m").unlink()
+    refreshed = collection.refresh()
+
+    assert {path.name for path in refreshed} == {
+        "@classFolder",
+        "classFolder.m",
+        "method.m",
+        "+moduleNamespace",
+        "new_function.m",
+        "module_function.m",
+    }
+    assert {path.name for path in parsed} <= {
+        "classFolder.m",
+        "method.m",
+        "new_function.m",
+        "Contents.m",
+    }
+    assert collection["classFolder"].members["method"].docstring.value == "Changed method."
+    assert collection["moduleNamespace.new_function"].docstring.value == "New function."
+    assert "module_function" not in collection
+    assert fixture_copy / "module_function.m" not in collection.lines_collection
+
+    fresh = MatlabPathsCollection([fixture_copy], recursive=True, working_directory=fixture_copy)
+    for identifier in fresh._mapping:
+        assert collection[identifier].path == fresh[identifier].path
+        assert collection[identifier].members.keys() == fresh[identifier].members.keys()
+
+
+def test_refresh_lists_changed_folders_only(
+    fixture_copy: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert refreshing a collection only lists the folders whose members changed."""
+    past = time.time_ns() - 60_000_000_000
+    for folder in [fixture_copy, *(path for path in fixture_copy.rglob("*") if path.is_dir())]:
+        os.utime(folder, ns=(past, past))
+    collection = MatlabPathsCollection(
+        [fixture_copy], recursive=True, working_directory=fixture_copy
+    )
+
+    listed: list[Path] = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: listed.append(Path(path)) or scandir(path))
+    assert collection.refresh() == set()
+    assert listed == []
+
+    method = fixture_copy / "@classFolder" / "method.m"
+    method.write_text(method.read_text().replace("Docstring for method.", "Changed method."))
+    (fixture_copy / "+moduleNamespace" / "new_function.m").write_text(
+        "function new_function()\n% New function.\nend\n"
+    )
+    refreshed = collection.refresh()
+
+    assert listed == [fixture_copy / "+moduleNamespace"]
+    assert {"method.m", "new_function.m"} <= {path.name for path in refreshed}
+    assert collection["classFolder"].members["method"].docstring.value == "Changed method."
+    assert collection["moduleNamespace.new_function"].docstring.value == "New function."
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_class_folder_members_match_maxx(tmp_path: Path, lazy: bool) -> None:
+    """Assert class folders with method and private files have the members `maxx` gives them."""
+    folder = tmp_path / "@Foo"
+    (folder / "private").mkdir(parents=True)
+    (folder / "Foo.m").write_text("classdef Foo\n    methods\n        method(obj)\n    end\nend\n")
+    (folder / "method.m").write_text("function method(obj)\n% Method.\nend\n")
+    (folder / "other.m").write_text("function other(obj)\n% Other.\nend\n")
+    (folder / "private" / "helper.m").write_text("function helper()\n% Helper.\nend\n")
+    (tmp_path / "func.m").write_text("function func()\n% Function.\nend\n")
+
+    reference = PathsCollection([tmp_path], recursive=True, working_directory=tmp_path)
+    collection = MatlabPathsCollection(
+        [tmp_path], recursive=True, working_directory=tmp_path, lazy=lazy
+    )
+
+    assert collection["Foo"].members.keys() == reference["Foo"].members.keys()
+    assert collection._local_collections.keys() == reference._local_collections.keys()
+    for path, local_collection in reference._local_collections.items():
+        assert (
+            collection._local_collections[path]._mapping.keys() == local_collection._mapping.keys()
+        )
+    for identifier in ("Foo.method", "Foo.other", "Foo.helper", "func"):
+        expected = reference.get_member(identifier)
+        member = collection.get_member(identifier)
+        assert (member is None) == (expected is None)
+        if expected is not None:
+            assert member.path == expected.path
@@ -12,6 +12,7 @@ from mkdocstrings_handlers.matlab.config import (
     PerStyleOptions,
     SphinxStyleOptions,
     SummaryOption,
+    options_fingerprint,
 )
 
 
@@ -164,6 +165,20 @@ def test_matlab_options_coerce_filters() -> None:
     assert coerced["filters"] == []
 
 
+def test_matlab_options_signature_types_variant() -> None:
+    """Test the signature types variant of options is built once and keeps other values."""
+    options = MatlabOptions(show_signature_types=False, line_length=42)
+    assert options.with_signature_types(False) is options
+
+    variant = options.with_signature_types(True)
+    assert variant is options.with_signature_types(True)
+    assert variant.show_signature_types is True
+    assert variant.line_length == 42
+    assert (
+        variant.fingerprint == MatlabOptions(show_signature_types=True, line_length=42).fingerprint
+    )
+
+
 def test_matlab_input_options_extract_extra() -> None:
     """Test MatlabInputOptions._extract_extra method."""
     data = {
@@ -252,3 +267,17 @@ def test_matlab_options_from_data() -> None:
     assert len(options.filters) == 2
     assert isinstance(options.summary, SummaryOption)
     assert options.summary.properties is True
+
+
+def test_matlab_options_fingerprint() -> None:
+    """Test options fingerprints only depend on option values."""
+    options = MatlabOptions.from_data(filters=["!^_"], summary=True)
+    same = MatlabOptions.from_data(summary=True, filters=["!^_"])
+    assert options.fingerprint == same.fingerprint
+    assert hash(options) == hash(same)
+    assert {options, same} == {options}
+    assert MatlabOptions.from_data(filters=["^_"], summary=True).fingerprint != options.fingerprint
+    assert MatlabOptions().fingerprint != options.fingerprint
+    assert options_fingerprint({"a": [1], "b": {"c": 2}}) == options_fingerprint(
+        {"b": {"c": 2}, "a": [1]}
+    )
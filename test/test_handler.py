@@ -2,20 +2,34 @@
 
 from __future__ import annotations
 
+import posixpath
+from io import BytesIO
 from pathlib import Path
-from typing import TYPE_CHECKING
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any
+from urllib.request import urlopen
+from xml.etree.ElementTree import tostring
 
 import pytest
 from griffe import (
+    Docstring,
     DocstringSectionExamples,
     DocstringSectionKind,
 )
+from markdown import Markdown
+from markdown.treeprocessors import Treeprocessor
+from markupsafe import Markup
 from mkdocs.exceptions import PluginError
-from mkdocstrings import CollectionError
+from mkdocstrings import CollectionError, Inventory
 
-from mkdocstrings_handlers.matlab import MatlabConfig, MatlabHandler, MatlabOptions
+from mkdocstrings_handlers.matlab import MatlabConfig, MatlabHandler, MatlabOptions, rendering
+from mkdocstrings_handlers.matlab import handler as handler_module
+from mkdocstrings_handlers.matlab.cache import HighlightCache, RenderCache, SourceTokensCache
+from mkdocstrings_handlers.matlab.collection import MatlabPathsCollection
 
 if TYPE_CHECKING:
+    from xml.etree.ElementTree import Element
+
     from mkdocstrings import MkdocstringsPlugin
 
 
@@ -232,6 +246,9 @@ def test_matlab_specific_filters(handler: MatlabHandler) -> None:
         "format_signature",
         "format_property",
         "filter_objects",
+        "partition_members",
+        "highlight_source",
+        "canonical_path",
         "stash_crossref",
         "get_template",
         "parse_docstring",
@@ -257,3 +274,409 @@ def test_matlab_domain_configuration(handler: MatlabHandler) -> None:
     assert handler.domain == "mat"
     assert handler.name == "matlab"
     assert handler.fallback_theme == "material"
+
+
+def test_rebuild_refreshes_paths_collection(tmp_path: Path) -> None:
+    """Assert a handler created again with the same paths reuses and refreshes the collection."""
+    (tmp_path / "func.m").write_text("function func()\n% First.\nend\n")
+
+    def create_handler() -> MatlabHandler:
+        return MatlabHandler(
+            base_dir=tmp_path,
+            config=MatlabConfig.from_data(paths=["."]),
+            theme="material",
+            custom_templates=None,
+            mdx=[],
+            mdx_config={},
+        )
+
+    first = create_handler()
+    assert first.collect("func", MatlabOptions()).docstring.value == "First."
+
+    (tmp_path / "func.m").write_text("function func()\n% Second docstring.\nend\n")
+    second = create_handler()
+    assert second._paths_collection is first._paths_collection
+    assert second.collect("func", MatlabOptions()).docstring.value == "Second docstring."
+
+
+def test_rebuild_keeps_latest_collection_only(tmp_path: Path) -> None:
+    """Assert collections and highlight caches of previous configurations are not kept."""
+    (tmp_path / "func.m").write_text("function func()\n% Docstring.\nend\n")
+
+    def create_handler(**config: Any) -> MatlabHandler:
+        return MatlabHandler(
+            base_dir=tmp_path,
+            config=MatlabConfig.from_data(paths=["."], **config),
+            theme="material",
+            custom_templates=None,
+            mdx=[],
+            mdx_config={},
+        )
+
+    first = create_handler()
+    second = create_handler(paths_recursive=True, cache_dir="cache")
+    assert second._paths_collection is not first._paths_collection
+    assert list(MatlabHandler._previous_builds.values()) == [
+        (second._paths_collection, second._highlight_cache)
+    ]
+
+    # Any other change of the configuration collects the paths again.
+    third = create_handler(paths_recursive=True, cache_dir="cache", lazy_lines=True)
+    assert third._paths_collection is not second._paths_collection
+    assert third._highlight_cache is not second._highlight_cache
+    # Rendering options do not change what is collected.
+    fourth = create_handler(
+        paths_recursive=True,
+        cache_dir="cache",
+        lazy_lines=True,
+        options={"show_root_heading": True},
+    )
+    assert fourth._paths_collection is third._paths_collection
+
+
+def test_handler_clears_member_orders(tmp_path: Path) -> None:
+    """Assert member orders and docstring sections of a previous build are not reused."""
+    members = [SimpleNamespace(path=name, name=name, kind="function") for name in "ba"]
+    rendering.member_order_cache.order(members, "alphabetical", None)
+    rendering.docstring_sections_cache.parse(Docstring("Summary."), "google", {})
+    MatlabHandler(
+        base_dir=tmp_path,
+        config=MatlabConfig.from_data(paths=["."]),
+        theme="material",
+        custom_templates=None,
+        mdx=[],
+        mdx_config={},
+    )
+    assert rendering.member_order_cache.misses == 0
+    assert not rendering.docstring_sections_cache._entries
+
+
+def test_render_cache_reuses_fragments(handler: MatlabHandler, tmp_path: Path) -> None:
+    """Assert cached fragments are rendered again only when their inputs change."""
+    handler._render_cache = RenderCache(tmp_path / "render")
+    options = handler.get_options({})
+    data = handler.collect("moduleClass", options)
+    html = handler.render(data, options)
+    headings = [tostring(heading) for heading in handler.get_headings()]
+    assert len(list((tmp_path / "render").iterdir())) == 1
+
+    def get_template(*args: Any, **kwargs: Any) -> None:
+        raise AssertionError("rendered again")
+
+    handler.env.get_template = get_template  # ty: ignore[invalid-assignment]
+    assert handler.render(data, options) == html
+    assert [tostring(heading) for heading in handler.get_headings()] == headings
+
+    with pytest.raises(AssertionError, match="rendered again"):
+        handler.render(data, handler.get_options({"show_source": False}))
+
+
+def test_render_cache_logs_warnings_again(tmp_path: Path) -> None:
+    """Assert the warnings logged while rendering are logged again on a cache hit."""
+    (tmp_path / "warned.m").write_text(
+        "function warned(a)\n% Docstring.\n%\n% Args:\n%     b: Not an argument.\nend\n"
+    )
+
+    def build() -> list[str]:
+        handler = MatlabHandler(
+            base_dir=tmp_path,
+            config=MatlabConfig.from_data(paths=["."], cache_dir="cache"),
+            theme="material",
+            custom_templates=None,
+            mdx=["toc"],
+            mdx_config={},
+        )
+        handler._update_env(Markdown())
+        options = handler.get_options({"docstring_style": "google"})
+        data = handler.collect("warned", options)
+        with handler_module._recording_warnings() as warnings:
+            handler.render(data, options)
+        return [message for _, _, message in warnings]
+
+    warnings = build()
+    assert any("parameter 'b'" in message for message in warnings)
+    assert len(list((tmp_path / "cache" / "render").iterdir())) == 1
+    assert build() == warnings
+
+
+class _RelativePathTreeprocessor(Treeprocessor):
+    """Stand-in for the MkDocs treeprocessor making links relative to the current page."""
+
+    def __init__(self, file: Any, files: Any = None, config: Any = None) -> None:
+        super().__init__()
+        self.file = file
+        self.files = files
+        self.config = config
+
+    def run(self, root: Element) -> None:
+        for element in root.iter("a"):
+            element.set("href", self.path_to_url(element.get("href", "")))
+
+    def path_to_url(self, url: str) -> str:
+        return posixpath.relpath(url, posixpath.dirname(self.file.src_uri) or ".")
+
+
+def test_render_cache_depends_on_page(tmp_path: Path) -> None:
+    """Assert fragments are cached per page, and never when docstrings link to other pages."""
+    (tmp_path / "plain.m").write_text("function plain()\n% Docstring.\nend\n")
+    (tmp_path / "linked.m").write_text("function linked()\n% See [usage](usage.md).\nend\n")
+    handler = MatlabHandler(
+        base_dir=tmp_path,
+        config=MatlabConfig.from_data(paths=["."], cache_dir="cache"),
+        theme="material",
+        custom_templates=None,
+        mdx=["toc"],
+        mdx_config={},
+    )
+    options = handler.get_options({})
+
+    def render(identifier: str, page: str) -> str:
+        md = Markdown()
+        relpath = _RelativePathTreeprocessor(SimpleNamespace(src_uri=page))
+        md.treeprocessors.register(relpath, "relpath", priority=0)
+        handler._update_env(md)
+        html = handler.render(handler.collect(identifier, options), options)
+        handler.get_headings()
+        return html
+
+    for page in ("index.md", "api/index.md", "index.md"):
+        render("plain", page)
+        assert 'href="usage.md"' in render("linked", "index.md")
+        assert 'href="../usage.md"' in render("linked", "api/index.md")
+    assert len(list((tmp_path / "cache" / "render").iterdir())) == 2
+    assert "path_to_url" not in vars(handler.md.treeprocessors["relpath"])
+
+
+class _AnchorsPlugin:
+    """Stand-in for the autorefs plugin."""
+
+    def __init__(self) -> None:
+        self.anchors: list[str] = []
+
+    def register_anchor(self, page: Any, identifier: str, *args: Any, **kwargs: Any) -> None:
+        self.anchors.append(identifier)
+
+
+class _AnchorsTreeprocessor(Treeprocessor):
+    """Stand-in for the autorefs treeprocessor registering the anchors of headings."""
+
+    def __init__(self, plugin: _AnchorsPlugin) -> None:
+        super().__init__()
+        self._plugin = plugin
+
+    def run(self, root: Element) -> None:
+        for element in root.iter():
+            if element.get("id"):
+                self._plugin.register_anchor(None, element.get("id"))
+
+
+def test_recording_anchors_restores_plugin(handler: MatlabHandler) -> None:
+    """Assert anchors are recorded while rendering only, leaving the plugin as it was."""
+    plugin = _AnchorsPlugin()
+    handler.md.treeprocessors.register(_AnchorsTreeprocessor(plugin), "anchors", priority=0)
+
+    with handler._recording_anchors() as anchors:
+        handler.md.convert("# Title")
+    handler.md.convert("# Other")
+
+    assert anchors == ["title"]
+    assert plugin.anchors == ["title", "other"]
+    assert "register_anchor" not in vars(plugin)
+
+
+def test_templates_bytecode_cache(tmp_path: Path) -> None:
+    """Assert compiled templates are cached in the cache directory and reused."""
+    (tmp_path / "func.m").write_text("function func()\n% Docstring.\nend\n")
+
+    def create_handler() -> MatlabHandler:
+        handler = MatlabHandler(
+            base_dir=tmp_path,
+            config=MatlabConfig.from_data(paths=["."], cache_dir="cache"),
+            theme="material",
+            custom_templates=None,
+            mdx=[],
+            mdx_config={},
+        )
+        handler._update_env(Markdown())
+        return handler
+
+    create_handler().env.get_template("class.html.jinja")
+    assert any((tmp_path / "cache" / "templates").iterdir())
+
+    handler = create_handler()
+    compiled = []
+    original = handler.env._compile
+
+    def compile_template(*args: Any, **kwargs: Any) -> Any:
+        compiled.append(args)
+        return original(*args, **kwargs)
+
+    handler.env._compile = compile_template  # ty: ignore[invalid-assignment]
+    handler.env.get_template("class.html.jinja")
+    assert compiled == []
+
+
+def test_render_cache_key_depends_on_sources(tmp_path: Path) -> None:
+    """Assert render cache keys change with the sources of the object and its bases."""
+    (tmp_path / "Base.m").write_text("classdef Base\n% Base class.\nend\n")
+    (tmp_path / "Child.m").write_text("classdef Child < Base\n% Child class.\nend\n")
+    collection = MatlabPathsCollection([tmp_path], working_directory=tmp_path)
+    cache = RenderCache(tmp_path / "render")
+
+    key = cache.key(collection["Child"], "options")
+    assert cache.key(collection["Child"], "options") == key
+    assert cache.key(collection["Child"], "other options") != key
+
+    (tmp_path / "Base.m").write_text("classdef Base\n% Changed base class.\nend\n")
+    assert cache.key(collection["Child"], "options") != key
+
+
+def test_inventories_load_offline_from_store(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert local inventories are loaded offline, and parsed once into the cache directory."""
+    inventory = Inventory(project="other", version="1.0")
+    inventory.register("other.func", "mat", "function", uri="api/#other.func")
+    inventory.register("other.Class", "mat", "class", uri="api/#other.Class")
+    inventory.register("other.py_func", "py", "function", uri="py/#other.py_func")
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "objects.inv").write_bytes(inventory.format_sphinx())
+
+    config = MatlabConfig.from_data(
+        paths=[],
+        cache_dir="cache",
+        inventories=[
+            "other/objects.inv",
+            {"url": "https://example.org/objects.inv", "base": "https://example.org/docs"},
+        ],
+    )
+    handler = MatlabHandler(
+        base_dir=tmp_path,
+        config=config,
+        theme="material",
+        custom_templates=None,
+        mdx=[],
+        mdx_config={},
+    )
+    store = handler._inventory_store
+    urls = handler.get_inventory_urls()
+    assert urls == [
+        (
+            (tmp_path / "other" / "objects.inv").as_uri(),
+            {"base_url": None, "domains": ["py"], "store": store},
+        ),
+        (
+            "https://example.org/objects.inv",
+            {"base_url": "https://example.org/docs", "domains": ["py"], "store": store},
+        ),
+    ]
+
+    url, conf = urls[0]
+    with urlopen(url) as file:  # noqa: S310
+        content = file.read()
+    base_url = "https://example.org/other"
+    expected = [
+        (item.name, f"{base_url}/{item.uri}")
+        for item in Inventory.parse_sphinx(BytesIO(content), domain_filter=["mat"]).values()
+    ]
+    assert len(expected) == 2
+    conf = {**conf, "base_url": base_url, "domains": ["mat"]}
+    assert list(MatlabHandler.load_inventory(BytesIO(content), url, **conf)) == expected
+    assert any((tmp_path / "cache" / "inventories").iterdir())
+
+    monkeypatch.setattr(Inventory, "parse_sphinx", pytest.fail)
+    assert list(MatlabHandler.load_inventory(BytesIO(content), url, **conf)) == expected
+    assert list(
+        MatlabHandler.load_inventory(BytesIO(content), url, domains=["py"], store=store)
+    ) == [("other.py_func", (tmp_path / "other").as_uri() + "/py/#other.py_func")]
+
+
+def test_highlight_cache(tmp_path: Path) -> None:
+    """Assert highlighted code is reused from memory and disk for the same arguments only."""
+    calls = []
+
+    def highlight(src: str, language: str | None = None, **kwargs: Any) -> str:
+        calls.append(src)
+        return f"<code>{src}</code>"
+
+    cache = HighlightCache(tmp_path, maxsize=1)
+    html = cache.highlight(highlight, "config", "x = 1", "matlab", linestart=3, linenums=True)
+    assert html == Markup("<code>x = 1</code>")
+    assert (
+        cache.highlight(highlight, "config", "x = 1", "matlab", linestart=3, linenums=True) == html
+    )
+    assert len(calls) == 1
+
+    cache.highlight(highlight, "config", "x = 1", "matlab", linestart=4, linenums=True)
+    cache.highlight(highlight, "other config", "x = 1", "matlab", linestart=3, linenums=True)
+    assert len(calls) == 3
+
+    # Evicted from memory, but still on disk.
+    other = HighlightCache(tmp_path)
+    other.highlight(highlight, "config", Markup("x = 1"), "matlab", linestart=3, linenums=True)
+    assert len(calls) == 3
+
+
+def test_highlight_cache_reused_by_identical_builds(tmp_path: Path) -> None:
+    """Assert signatures with stashed cross-references are highlighted once across builds."""
+    (tmp_path / "func.m").write_text(
+        "function func(a, b)\n% Docstring.\narguments\n  a double\n  b func = 1\nend\nend\n"
+    )
+    highlight_dir = tmp_path / "cache" / "highlight"
+    counts = []
+    for _ in range(3):
+        MatlabHandler._previous_builds.clear()
+        handler = MatlabHandler(
+            base_dir=tmp_path,
+            config=MatlabConfig.from_data(paths=["."], cache_dir="cache"),
+            theme="material",
+            custom_templates=None,
+            mdx=["toc"],
+            mdx_config={},
+        )
+        handler._update_env(Markdown(extensions=["toc"]))
+        handler._render_cache = None
+        options = handler.get_options(
+            {
+                "show_root_heading": True,
+                "separate_signature": True,
+                "signature_crossrefs": True,
+                "show_signature_types": True,
+            }
+        )
+        html = handler.render(handler.collect("func", options), options)
+        assert "autorefs-external" in html
+        counts.append(len(list(highlight_dir.iterdir())))
+    assert counts[0] == counts[1] == counts[2]
+
+
+def test_highlight_source_lexes_files_once(
+    handler: MatlabHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Assert source code sliced from the tokens of its file is highlighted as if lexed alone."""
+    monkeypatch.setattr(rendering, "source_tokens_cache", SourceTokensCache())
+    highlighter = rendering.SourceHighlighter(Markdown(extensions=["pymdownx.highlight"]))
+    module_class = handler._paths_collection["moduleClass"]  # ty: ignore[not-subscriptable]
+    lexed = []
+    lex = rendering.source_tokens_cache._lex
+    monkeypatch.setattr(
+        rendering.source_tokens_cache,
+        "_lex",
+        lambda lexer, path, lines: lexed.append(path) or lex(lexer, path, lines),
+    )
+
+    for obj in [module_class, *module_class.members.values()]:
+        if not obj.lineno or not obj.endlineno:
+            continue
+        kwargs = {"language": "matlab", "linestart": obj.lineno, "linenums": True}
+        token = rendering._source_location.set(
+            (obj.filepath, obj.lines_collection[obj.filepath], obj.lineno, obj.endlineno)
+        )
+        try:
+            sliced = highlighter.highlight(obj.source, **kwargs)
+        finally:
+            rendering._source_location.reset(token)
+        assert sliced == highlighter.highlight(obj.source, **kwargs)
+
+    assert lexed
+    assert len(rendering.source_tokens_cache._entries) == 1
@@ -87,6 +87,67 @@ def test_get_options_with_invalid_options(handler: MatlabHandler) -> None:
         handler.get_options({"heading_level": "invalid"})
 
 
+def test_get_options_reuses_options(handler: MatlabHandler) -> None:
+    """Test get_options builds each distinct configuration once."""
+    options = handler.get_options({"filters": ["!^_"], "extra": {"key": "value"}})
+    assert handler.get_options({"extra": {"key": "value"}, "filters": ["!^_"]}) is options
+    assert handler.get_options({"filters": ["^_"]}) is not options
+    assert handler.get_options({"filters": ["^_"]}).fingerprint != options.fingerprint
+    # Options given differently but coercing to the same values share one instance.
+    assert handler.get_options({"heading_level": 2}) is handler.get_options({})
+
+
+def test_collect_many_reuses_resolved_objects(
+    handler: MatlabHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test collect_many collects the same objects as collect, resolving each one once."""
+    options = handler.get_options({})
+    identifiers = [
+        "moduleNamespace.namespace_function",
+        "moduleNamespace.namespaceClass",
+        "moduleClass",
+        "moduleNamespace.namespace_function",
+    ]
+    lookups: list[str] = []
+    lookup = handler._lookup
+    monkeypatch.setattr(
+        handler, "_lookup", lambda identifier: lookups.append(identifier) or lookup(identifier)
+    )
+
+    models = handler.collect_many(identifiers, options)
+    assert models == [handler.collect(identifier, options) for identifier in identifiers]
+    assert models[0] is models[3]
+    assert sorted(lookups) == sorted({"moduleNamespace", *identifiers})
+
+    with pytest.raises(CollectionError, match="not found"):
+        handler.collect_many(["moduleClass", "moduleNamespace.missing"], options)
+
+
+def test_collect_falls_back_to_collection_lookup(
+    handler: MatlabHandler, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test dotted identifiers missing from their parent's members are looked up in the collection."""
+    options = handler.get_options({})
+    collection = handler._paths_collection
+    method = handler.collect("classFolder.method", options)
+    assert method.path == collection.get_member("classFolder.method").path
+
+    get_member = collection.get_member
+    folder = next(path for path in collection._local_collections if path.name == "@classFolder")
+    helper = collection._local_collections[folder]
+    monkeypatch.setattr(
+        collection,
+        "get_member",
+        lambda identifier, working_directory=None: (
+            helper.get_member("method")
+            if identifier == "classFolder.helper"
+            else get_member(identifier, working_directory)
+        ),
+    )
+    assert "helper" not in handler.collect("classFolder", options).members
+    assert handler.collect("classFolder.helper", options) is helper.get_member("method")
+
+
 def test_collect_with_path_identifier(handler: MatlabHandler) -> None:
     """Test collecting with a path identifier (contains /)."""
     # This test assumes the handler has access to fixture directory
@@ -0,0 +1,61 @@
+"""Tests for the `hierarchy` module."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from mkdocstrings_handlers.matlab import rendering
+from mkdocstrings_handlers.matlab.collection import MatlabPathsCollection
+from mkdocstrings_handlers.matlab.hierarchy import HierarchyIndex
+
+FIXTURE = Path(__file__).parent / "fixture"
+
+
+def _collection() -> MatlabPathsCollection:
+    return MatlabPathsCollection([FIXTURE], recursive=True, working_directory=FIXTURE)
+
+
+def test_hierarchy_ancestors_and_descendants() -> None:
+    """Assert the index resolves the ancestors and descendants of classes."""
+    collection = _collection()
+    index = HierarchyIndex(collection)
+    sub_class, module_class = collection["subClass"], collection["moduleClass"]
+
+    assert index.parents(sub_class) == (module_class,)
+    assert index.ancestors(sub_class) == (module_class, "handle")
+    assert index.ancestors(sub_class) is index.ancestors(sub_class)
+    assert index.descendants(module_class) == (sub_class,)
+    assert index.descendants(sub_class) == ()
+
+
+def test_hierarchy_diagram_caps() -> None:
+    """Assert diagrams only show the requested number of generations."""
+    index = HierarchyIndex(_collection())
+    sub_class = index.paths_collection["subClass"]  # ty: ignore[not-subscriptable]
+
+    assert index.diagram(sub_class) == (
+        "```mermaid\nflowchart TB\n"
+        "   subClass[subClass]\n   moduleClass[moduleClass]\n   handle[handle]\n"
+        "   moduleClass --> subClass\n   handle --> moduleClass\n```"
+    )
+    assert index.diagram(sub_class, max_depth=1) == (
+        "```mermaid\nflowchart TB\n"
+        "   subClass[subClass]\n   moduleClass[moduleClass]\n"
+        "   moduleClass --> subClass\n```"
+    )
+    assert index.diagram(sub_class, max_breadth=0) is None
+
+
+def test_inheritance_diagrams_do_not_leak() -> None:
+    """Assert the diagram of a class does not include classes of earlier diagrams."""
+    collection = _collection()
+    rendering.do_as_inheritance_diagram_section(collection["subClass"])
+    section = rendering.do_as_inheritance_diagram_section(collection["moduleClass"])
+
+    assert section is not None
+    assert "subClass" not in section.value
+
+    index = collection.hierarchy
+    assert collection.hierarchy is index
+    collection.addpath(FIXTURE / "+moduleNamespace")
+    assert collection.hierarchy is not index
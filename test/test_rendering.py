@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
+import gc
+import itertools
+import operator
+import random
 import re
-from dataclasses import dataclass
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
 
 import pytest
+from griffe import Docstring
+from jinja2 import ChoiceLoader, DictLoader
+from markupsafe import Markup
+from pygments.lexers import get_lexer_by_name
 
 from mkdocstrings_handlers.matlab import rendering
 
+if TYPE_CHECKING:
+    from mkdocstrings_handlers.matlab.handler import MatlabHandler
+
 
 @dataclass
 class _FakeMatlabObject:
@@ -20,6 +33,7 @@ class _FakeMatlabObject:
     is_private: bool = False
     is_hidden: bool = False
     path: str = ""
+    kind: str = "function"
 
     def __post_init__(self):
         if not self.path:
@@ -126,6 +140,46 @@ def test_filter_inherited_members(
     assert names == expected_names
 
 
+@pytest.mark.parametrize(
+    "filters",
+    [
+        ["!^_"],
+        ["!^_", "!method$"],
+        ["^func", "method"],
+        ["^func", "!B$"],
+        ["(a)\\1"],
+        ["(?i)^FUNC", "!^_"],
+    ],
+)
+def test_compiled_name_filter(filters: list[str]) -> None:
+    """Assert compiled name filters keep the same names as filters searched one by one.
+
+    Parameters:
+        filters: The filters (parametrized).
+    """
+    compiled = [(re.compile(filtr.lstrip("!")), filtr.startswith("!")) for filtr in filters]
+    keep = rendering._compile_name_filter(compiled)
+    for name in ["funcA", "funcB", "_private", "method", "aa", "FUNC", "other"]:
+        assert keep(name) is rendering._keep_object(name, compiled)
+
+
+def test_partition_members() -> None:
+    """Assert members are filtered and grouped by kind, with filters shared between calls."""
+    kinds = {"prop": "property", "_prop": "property", "method": "function", "Sub": "class"}
+    objects = {}
+    for name, kind in kinds.items():
+        obj = _FakeMatlabObject(name, is_private=name.startswith("_"))
+        obj.kind = rendering.Kind(kind)  # ty: ignore[unresolved-attribute]
+        objects[name] = obj
+
+    options = {"filters": [(re.compile("^m"), True)], "private_members": False}
+    partition = rendering.do_partition_members(objects, **options)  # ty: ignore[invalid-argument-type]
+    assert [obj.name for obj in partition.properties] == ["prop"]
+    assert [obj.name for obj in partition.classes] == ["Sub"]
+    assert partition.functions == partition.scripts == []
+    assert rendering.get_member_filter(**options) is rendering.get_member_filter(**options)
+
+
 @pytest.mark.parametrize(
     ("order", "members_list", "expected_names"),
     [
@@ -153,6 +207,8 @@ def test_ordering_members(
     class MatlabObj:
         def __init__(self, name: str, lineno: int | None = None) -> None:
             self.name = name
+            self.path = name
+            self.kind = "function"
             self.lineno = lineno
 
     members = [MatlabObj("funcA", 10), MatlabObj("funcB", 9), MatlabObj("funcC", 8)]
@@ -160,6 +216,34 @@ def test_ordering_members(
     assert [obj.name for obj in ordered] == expected_names
 
 
+def test_member_order_cache() -> None:
+    """Assert member orders are reused until the members change."""
+    members = [_FakeMatlabObject("funcB"), _FakeMatlabObject("funcA")]
+    cache = rendering.MemberOrderCache()
+
+    first = cache.order(members, "alphabetical", None)
+    second = cache.order(list(members), "alphabetical", None)
+    assert [obj.name for obj in first] == [obj.name for obj in second] == ["funcA", "funcB"]
+    assert second is not first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Members built again, like the aliases of inherited members, reuse the order
+    # and are returned themselves.
+    rebuilt = [_FakeMatlabObject("funcB"), _FakeMatlabObject("funcA")]
+    third = cache.order(rebuilt, "alphabetical", None)
+    assert third == [rebuilt[1], rebuilt[0]]
+    assert all(map(operator.is_, third, [rebuilt[1], rebuilt[0]]))
+    assert (cache.hits, cache.misses) == (2, 1)
+    cache.order([_FakeMatlabObject("funcB", path="Other.funcB"), members[1]], "alphabetical", None)
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    cache.order(members, "alphabetical", ["funcB"])
+    cache.order([*members, _FakeMatlabObject("funcC")], "alphabetical", None)
+    assert (cache.hits, cache.misses) == (2, 4)
+    cache.clear()
+    assert (cache.hits, cache.misses) == (0, 0)
+
+
 def test_stash_crossref_filter() -> None:
     """Test that cross-reference stashing works correctly."""
     stash_filter = rendering.do_stash_crossref
@@ -175,6 +259,85 @@ def test_stash_crossref_filter() -> None:
     stash_filter.stash.clear()  # Clear stash after test
 
 
+def test_unstash_crossrefs() -> None:
+    """Assert all stashed cross-references are restored in a single pass."""
+    stash_filter = rendering._StashCrossRefFilter()
+    keys = [stash_filter(f"<autoref>{name}\\1</autoref>", length=6) for name in ("a", "b")]
+    text = f"{keys[0]}({keys[1]}, {keys[0]}x, x{keys[1]})"
+
+    assert stash_filter.unstash(text) == (
+        f"<autoref>a\\1</autoref>(<autoref>b\\1</autoref>, {keys[0]}x, x{keys[1]})"
+    )
+    assert stash_filter.stash == {}
+    assert stash_filter.unstash(text) == text
+
+
+def test_crossref_stash_scopes() -> None:
+    """Assert stash scopes are isolated from each other, and from other threads."""
+    stash_filter = rendering._StashCrossRefFilter()
+    outer_key = stash_filter("outer", length=8)
+    with stash_filter.scope() as inner:
+        inner_key = stash_filter("inner", length=8)
+        assert inner == {inner_key: "inner"}
+        assert stash_filter.unstash(f"{outer_key} {inner_key}") == f"{outer_key} inner"
+    with pytest.raises(RuntimeError), stash_filter.scope():
+        stash_filter("leaked", length=8)
+        raise RuntimeError
+    assert stash_filter.stash == {outer_key: "outer"}
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        assert executor.submit(lambda: stash_filter.stash).result() == {}
+    stash_filter.stash.clear()
+
+
+class _CountingPattern:
+    """A compiled pattern counting its substitutions and the words they visit."""
+
+    def __init__(self, pattern: re.Pattern[str]) -> None:
+        self.pattern = pattern
+        self.passes = 0
+        self.matches = 0
+
+    def sub(self, repl: Callable[[re.Match[str]], str], text: str) -> str:
+        self.passes += 1
+
+        def count(match: re.Match[str]) -> str:
+            self.matches += 1
+            return repl(match)
+
+        return self.pattern.sub(count, text)
+
+
+@pytest.mark.parametrize("count", [1, 200, 2000])
+def test_unstash_crossrefs_in_one_pass(monkeypatch: pytest.MonkeyPatch, count: int) -> None:
+    """Assert all crossrefs are restored in a single scan over the text.
+
+    With one substitution over the whole text per key, ten times more crossrefs
+    in a ten times longer text took a hundred times longer.
+    """
+    stash_filter = rendering._StashCrossRefFilter()
+    crossrefs = [f"<autoref>Type{i}</autoref>" for i in range(count)]
+    text = ", ".join(stash_filter(crossref, length=8) for crossref in crossrefs)
+    pattern = _CountingPattern(rendering._STASH_KEY_PATTERN)
+    monkeypatch.setattr(rendering, "_STASH_KEY_PATTERN", pattern)
+
+    assert stash_filter.unstash(text) == ", ".join(crossrefs)
+    assert pattern.passes == 1
+    assert pattern.matches == count
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"stripnl": False}, {"stripall": True}, {"tabsize": 4}, {"ensurenl": False}],
+)
+def test_sliced_lexer_preprocesses_as_lexer(options: dict[str, Any]) -> None:
+    """Assert texts are prepared for lexing as the lexer itself prepares them."""
+    lexer = get_lexer_by_name("matlab", **options)
+    sliced = rendering._SlicedLexer(lexer, (Path("file.m"), [], 1, 1))
+    for text in ["\n\nx = 1;\r\n\ty = 2;  \n\n", "\ufeffz = 3;", "  w = 4;"]:
+        assert sliced._preprocess(text) == "".join(value for _, value in lexer.get_tokens(text))
+
+
 def test_format_property() -> None:
     """Test MATLAB property formatting."""
     # This would need actual Property objects for full testing
@@ -182,6 +345,128 @@ def test_format_property() -> None:
     assert hasattr(rendering, "do_format_property")
 
 
+def _fixture_objects(handler: MatlabHandler) -> list[Any]:
+    objects = []
+    stack = [
+        handler._paths_collection[identifier] for identifier in handler._paths_collection._mapping
+    ]  # ty: ignore[not-subscriptable]
+    while stack:
+        obj = stack.pop()
+        objects.append(obj)
+        stack.extend(member for member in obj.members.values() if not member.is_alias)
+    return objects
+
+
+def _render_with_stash(handler: MatlabHandler, render: Callable[[], str]) -> tuple[str, dict]:
+    stash_crossref = handler.env.filters["stash_crossref"]
+    random.seed(0)
+    with stash_crossref.scope() as stash:
+        return render(), dict(stash)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        dict(
+            zip(
+                (
+                    "separate_signature",
+                    "signature_crossrefs",
+                    "show_signature_types",
+                    "argument_headings",
+                    "merge_constructor_into_class",
+                ),
+                values,
+            )
+        )
+        for values in itertools.product((False, True), repeat=5)
+    ],
+)
+def test_native_rendering_matches_templates(
+    handler: MatlabHandler, options: dict[str, bool]
+) -> None:
+    """Assert signatures and expressions rendered natively are byte-identical to the templates."""
+    config = handler.get_options(options)
+    env = handler.env
+    signature_template = env.get_template("signature.html.jinja")
+    expression_template = env.get_template("expression.html.jinja")
+    objects = _fixture_objects(handler)
+    assert any(obj.is_function for obj in objects)
+    assert any(obj.is_property for obj in objects)
+
+    for obj in objects:
+        if obj.is_function:
+            for annotations in (False, True):
+                jinja_config = replace(config, show_signature_types=annotations)
+                assert _render_with_stash(
+                    handler,
+                    lambda: rendering._render_signature(env, obj, config, annotations=annotations),
+                ) == _render_with_stash(
+                    handler,
+                    lambda: signature_template.render(
+                        config=jinja_config, function=obj, signature=True
+                    ),
+                )
+        elif obj.is_property:
+            for expression in (obj.type, obj.default):
+                if expression:
+                    assert _render_with_stash(
+                        handler,
+                        lambda: rendering._render_expression(
+                            env, expression, config, signature=True
+                        ),
+                    ) == _render_with_stash(
+                        handler,
+                        lambda: expression_template.render(
+                            config=config, expression=expression, signature=True
+                        ),
+                    )
+
+
+def test_native_rendering_skips_overridden_templates(handler: MatlabHandler) -> None:
+    """Assert templates overridden by users are rendered through Jinja."""
+    assert rendering._is_native(handler.env, "signature.html.jinja", "expression.html.jinja")
+    env = handler.env.overlay(
+        loader=ChoiceLoader([DictLoader({"expression.html.jinja": "custom"}), handler.env.loader])
+    )
+    assert rendering._is_native(env, "signature.html.jinja")
+    assert not rendering._is_native(env, "signature.html.jinja", "expression.html.jinja")
+
+
+def test_render_overlay_matches_render(handler: MatlabHandler) -> None:
+    """Assert templates rendered over the parent context render as with a copy of it."""
+    env = handler.env
+    context = env.from_string("").new_context({"name": "parent", "other": "kept"})
+    template = env.from_string("{{ name }} {{ other }} {{ extra }}")
+
+    html = rendering._render_overlay(template, context, name="child", extra=1)
+    assert html == template.render(dict(context.parent), name="child", extra=1) == "child kept 1"
+    assert context.parent["name"] == "parent"
+
+
+def test_format_signature_with_overridden_templates(handler: MatlabHandler) -> None:
+    """Assert signatures rendered through overridden templates match native signatures."""
+    source = handler.env.loader.get_source(handler.env, "expression.html.jinja")[0]  # ty: ignore[possibly-missing-attribute]
+    overridden = handler.env.overlay(
+        loader=ChoiceLoader([DictLoader({"expression.html.jinja": source}), handler.env.loader])
+    )
+    config = handler.get_options({"separate_signature": True, "signature_crossrefs": True})
+    function = handler._paths_collection["module_arguments"]  # ty: ignore[not-subscriptable]
+
+    signatures = []
+    for env in (handler.env, overridden):
+        context = env.from_string("").new_context({"config": config})
+        for show_types in (None, True):
+            random.seed(0)
+            signatures.append(
+                rendering.do_format_signature(
+                    context, Markup("module_arguments"), function, 80, annotations=show_types
+                )
+            )
+    assert signatures[:2] == signatures[2:]
+    assert signatures[0] != signatures[1]
+
+
 def test_as_properties_section() -> None:
     """Test conversion of MATLAB properties to docstring section."""
     # This would need actual Property objects for full testing
@@ -227,3 +512,40 @@ def test_autorefs_hook() -> None:
     from mkdocstrings_handlers.matlab.rendering import AutorefsHook
 
     assert AutorefsHook is not None
+
+
+def test_docstring_sections_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Assert parsed docstring sections are reused per docstring, style, options and parent."""
+    calls = []
+    original = rendering.parse
+
+    def parse(*args: Any, **kwargs: Any) -> Any:
+        calls.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(rendering, "parse", parse)
+    cache = rendering.DocstringSectionsCache(maxsize=2)
+    parent = _FakeMatlabObject("func")
+    docstring = Docstring("Summary.\n\nArgs:\n    x: The x value.", parent=parent)
+
+    sections = cache.parse(docstring, "google", {})
+    sections.append("mutated")
+    assert cache.parse(docstring, "google", {}) == sections[:-1]
+    assert cache.parse(docstring, rendering.Parser.google, None) == sections[:-1]
+    assert len(calls) == 1
+
+    cache.parse(docstring, "google", {"warn_unknown_params": False})
+    cache.parse(Docstring(docstring.value, parent=_FakeMatlabObject("other")), "google", {})
+    assert len(calls) == 3
+
+    # The least recently used entry was evicted.
+    cache.parse(docstring, "google", {})
+    assert len(calls) == 4
+
+    # Entries do not keep their object alive, and are not reused for another object.
+    other = Docstring(docstring.value, parent=_FakeMatlabObject("func"))
+    del docstring, parent
+    gc.collect()
+    assert all(entry[0]() is None for entry in cache._entries.values() if entry[0] is not None)
+    cache.parse(other, "google", {})
+    assert len(calls) == 5
@@ -97,6 +97,8 @@ def test_order_members_with_manual_list() -> None:
     class Member:
         name: str
         lineno: int = 0
+        path: str = ""
+        kind: str = "function"
 
     members = [
         Member(name="third", lineno=3),
@@ -120,6 +122,8 @@ def test_order_members_with_list_order() -> None:
     class Member:
         name: str
         lineno: int = 0
+        path: str = ""
+        kind: str = "function"
 
     members = [Member(name="b", lineno=2), Member(name="a", lineno=1)]
 
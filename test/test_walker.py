@@ -0,0 +1,125 @@
+"""Tests for the `walker` module."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from maxx.collection import _PathGlobber
+
+from mkdocstrings_handlers.matlab.walker import PathWalker
+
+FIXTURE = Path(__file__).parent / "fixture"
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    """Return a folder with MATLAB files at several depths."""
+    for name in (
+        "src/top.m",
+        "src/a/a.m",
+        "src/a/b/b.m",
+        "src/a/b/c/c.m",
+        "src/+pkg/f.m",
+        "src/tests/test_a.m",
+        "src/build/generated.m",
+        "docs/readme.md",
+    ):
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text("function x\nend\n")
+    return tmp_path
+
+
+def _relative(paths: list[Path], root: Path) -> list[str]:
+    return [path.relative_to(root).as_posix() for path in paths]
+
+
+@pytest.mark.parametrize("recursive", [False, True])
+@pytest.mark.parametrize("parse_live_scripts", [False, True])
+def test_members_match_path_globber(recursive: bool, parse_live_scripts: bool) -> None:
+    """Assert the walker lists the same members as maxx, in the same order."""
+    members = PathWalker(FIXTURE).members(
+        FIXTURE, recursive=recursive, parse_live_scripts=parse_live_scripts
+    )
+    assert members == list(
+        _PathGlobber(FIXTURE, recursive=recursive, parse_live_scripts=parse_live_scripts)
+    )
+
+
+def test_expand_matches_glob(tree: Path) -> None:
+    """Assert patterns are expanded like `Path.glob`, in a single walk."""
+    patterns = ["src/*", "**/b", "*"]
+    walker = PathWalker(tree)
+    expanded = walker.expand(patterns)
+
+    assert expanded == [
+        [path for path in tree.glob(pattern) if path.is_dir()] for pattern in patterns
+    ]
+
+    # Only the folders that can contain matches are walked.
+    walker = PathWalker(tree)
+    assert walker.expand(["src/*"]) == [
+        [path for path in (tree / "src").iterdir() if path.is_dir()]
+    ]
+    assert tree / "docs" not in walker._listings
+    assert tree / "src" / "a" not in walker._listings
+
+
+def test_exclude_gitignore_and_max_depth(tree: Path) -> None:
+    """Assert excluded, ignored and too deep folders are left out."""
+    (tree / ".git").mkdir()
+    (tree / ".gitignore").write_text("# generated\nbuild/\n")
+    src = tree / "src"
+
+    walker = PathWalker(tree, exclude=["src/tests/**"], gitignore=True, max_depth=2)
+    assert sorted(_relative(walker.members(src, recursive=True), src)) == [
+        "+pkg",
+        "+pkg/f.m",
+        "a",
+        "a/a.m",
+        "a/b",
+        "a/b/b.m",
+        "top.m",
+    ]
+    assert tree / "src" / "tests" not in walker._listings
+
+    assert set(_relative(PathWalker(tree).members(src, recursive=True), src)) >= {
+        "tests/test_a.m",
+        "build/generated.m",
+        "a/b/c/c.m",
+    }
+
+
+@pytest.mark.skipif(not hasattr(os, "symlink"), reason="requires symbolic links")
+def test_symlink_loops(tree: Path) -> None:
+    """Assert symbolic links to parent folders are not followed."""
+    (tree / "src" / "a" / "loop").symlink_to(tree / "src", target_is_directory=True)
+    (tree / "src" / "docs").symlink_to(tree / "docs", target_is_directory=True)
+
+    members = PathWalker(tree).members(tree / "src", recursive=True)
+    assert not any("loop" in path.parts for path in members)
+    assert tree / "src" / "a" / "b" / "c" / "c.m" in members
+
+
+def test_revalidate_forgets_changed_folders(tree: Path) -> None:
+    """Assert only the folders whose members were added or removed are listed again."""
+    past = 1_000_000_000_000_000_000
+    for folder in [tree, *(path for path in tree.rglob("*") if path.is_dir())]:
+        os.utime(folder, ns=(past, past))
+    src = tree / "src"
+    walker = PathWalker(tree)
+    walker.members(src, recursive=True)
+    assert walker.is_dir(src / "a")
+    assert walker.exists(src / "top.m")
+    assert not walker.exists(src / "new.m")
+    listed = set(walker._listings)
+
+    (src / "a" / "b" / "b.m").write_text("function b\n% Edited in place.\nend\n")
+    assert walker.revalidate() == set()
+    (src / "new.m").write_text("function new\nend\n")
+    assert walker.revalidate() == {src}
+    assert walker._listings.keys() == listed - {src}
+    assert walker.exists(src / "new.m")
+    # Folders modified just before they are listed are listed again on each revalidation.
+    assert walker.revalidate() == {src}